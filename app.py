@@ -1,30 +1,302 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request, Response
+import hmac
 import json
 import os
-from datetime import datetime
+import socket
+import re
+from datetime import date, datetime
+
+import game_index
+import snapshot_delta
+import refresh_trigger
+import snapshot_shm
+import standings_history
+import updater_lock
 
 app = Flask(__name__)
 CACHE_FILE = "standings_cache.json"
+CHANGES_FILE = snapshot_delta.CHANGES_FILE
+GAMES_BY_DATE_FILE = "games_by_date.json"
+POSTSEASON_INDEX_FILE = "postseason_index.json"
+TEAM_LOGS_FILE = "team_logs.json"
+HISTORY_FILE = standings_history.HISTORY_FILE
+
+# Refresco a pedido (/api/refresh): deshabilitado si no hay REFRESH_TOKEN
+REFRESH_TOKEN = os.getenv("REFRESH_TOKEN", "")
+CACHE_COMPACT_FILE = "standings_cache_compact.json"
+
+# Modo memoria compartida (SNAPSHOT_SHM=1): un lector por worker (completo y compacto)
+shm_reader = snapshot_shm.SnapshotReader() if snapshot_shm.SHM_ENABLED else None
+shm_compact_reader = snapshot_shm.SnapshotReader(snapshot_shm.SHM_COMPACT_FILE) if snapshot_shm.SHM_ENABLED else None
+
+# Bytes del snapshot compacto (se sirven sin parsear), por mtime
+_compact_cache = {"mtime": None, "body": None}
+
+# Artefactos JSON parseados por worker, reutilizados mientras no cambie el archivo
+_json_cache = {}
+
+def _read_shm(reader=shm_reader):
+    if reader is None:
+        return None
+    try:
+        return reader.read()
+    except Exception:
+        return None  # si el mmap falla, caemos al archivo JSON
+
+def _shm_response(snap):
+    version, body = snap
+    resp = Response(body, mimetype="application/json")
+    resp.set_etag(str(version))
+    return resp.make_conditional(request)
+
+def _load_snapshot():
+    """Snapshot completo como dict (desde el mmap o el archivo JSON)."""
+    snap = _read_shm()
+    if snap is not None:
+        return json.loads(snap[1])
+    with open(CACHE_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # Opcional: añadir la marca de tiempo de la última actualización
+    data["last_updated"] = datetime.fromtimestamp(os.path.getmtime(CACHE_FILE)).strftime("%Y-%m-%d %H:%M:%S")
+    return data
+
+def _load_json_cached(path):
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = (mtime, json.load(f))
+        _json_cache[path] = cached
+    return cached[1]
 
 @app.route("/")
 def index():
     return render_template("index.html")
 
+def _compact_response():
+    try:
+        mtime = os.path.getmtime(CACHE_COMPACT_FILE)
+    except OSError:
+        return None
+    if _compact_cache["mtime"] != mtime:
+        with open(CACHE_COMPACT_FILE, "rb") as f:
+            _compact_cache["body"] = f.read()
+        _compact_cache["mtime"] = mtime
+    resp = Response(_compact_cache["body"], mimetype="application/json")
+    resp.set_etag(f"c{mtime}")
+    return resp.make_conditional(request)
+
 @app.route("/api/full")
 def api_full():
+    # ?format=compact: postseason_games en columnas (ver snapshot_compact)
+    if request.args.get("format") == "compact":
+        snap = _read_shm(shm_compact_reader)
+        if snap is not None:
+            return _shm_response(snap)
+        resp = _compact_response()
+        if resp is not None:
+            return resp
+
+    snap = _read_shm()
+    if snap is not None:
+        return _shm_response(snap)
+
     if not os.path.exists(CACHE_FILE):
         return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
 
     try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        # Opcional: añadir la marca de tiempo de la última actualización
-        data["last_updated"] = datetime.fromtimestamp(os.path.getmtime(CACHE_FILE)).strftime("%Y-%m-%d %H:%M:%S")
-        
-        return jsonify(data)
+        return jsonify(_load_snapshot())
     except Exception as e:
         return jsonify({"error": f"Failed to read cached data: {e}"}), 500
 
+@app.route("/api/changes")
+def api_changes():
+    """
+    Solo lo que cambió desde ?since=<version>. Si la versión es muy antigua
+    (o no viene), responde {"full": true, "snapshot": <payload completo>}.
+    """
+    since = request.args.get("since", type=int)
+    try:
+        log = _load_json_cached(CHANGES_FILE)
+        delta = snapshot_delta.changes_since(log, since) if (log and since is not None) else None
+        if delta is not None:
+            return jsonify({"full": False, "version": delta["to"], **delta})
+        if not os.path.exists(CACHE_FILE) and _read_shm() is None:
+            return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+        data = _load_snapshot()
+        return jsonify({"full": True, "version": data.get("version"), "snapshot": data})
+    except Exception as e:
+        return jsonify({"error": f"Failed to read cached data: {e}"}), 500
+
+@app.route("/api/games")
+def api_games():
+    """
+    Juegos de un día: /api/games?date=YYYY-MM-DD -> {date, games, summary}.
+    Sin ?date= lista los días disponibles con su resumen.
+    """
+    try:
+        index = _load_json_cached(GAMES_BY_DATE_FILE)
+    except Exception as e:
+        return jsonify({"error": f"Failed to read cached data: {e}"}), 500
+    if index is None:
+        return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+
+    days = index.get("days") or {}
+    date = request.args.get("date")
+    if not date:
+        return jsonify({"mode": index.get("mode"), "days": {d: v["summary"] for d, v in days.items()}})
+    if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", date):
+        return jsonify({"error": "Formato de fecha inválido, use YYYY-MM-DD."}), 400
+    day = days.get(date) or {"games": [], "summary": {"games": 0, "runs": 0, "first": None, "last": None, "teams": {}}}
+    return jsonify({"date": date, "mode": index.get("mode"), **day})
+
+# Índice de postemporada (claves ordenadas para bisect), por mtime
+_index_cache = {"mtime": None, "index": None}
+
+def _game_index():
+    try:
+        mtime = os.path.getmtime(POSTSEASON_INDEX_FILE)
+    except OSError:
+        return None
+    if _index_cache["mtime"] != mtime:
+        _index_cache["index"] = game_index.GameIndex(_load_json_cached(POSTSEASON_INDEX_FILE))
+        _index_cache["mtime"] = mtime
+    return _index_cache["index"]
+
+def _games_page(team=None):
+    limit = min(max(request.args.get("limit", game_index.PAGE_SIZE, type=int), 1), game_index.MAX_PAGE_SIZE)
+    try:
+        index = _game_index()
+    except Exception as e:
+        return jsonify({"error": f"Failed to read cached data: {e}"}), 500
+    if index is None:
+        return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+    if team is not None:
+        canonical = index.team(team)
+        if canonical is None:
+            return jsonify({"error": f"Equipo desconocido: {team}"}), 404
+        team = canonical
+    try:
+        page = index.page(team, request.args.get("cursor"), limit)
+    except ValueError:
+        return jsonify({"error": "Cursor inválido."}), 400
+    return jsonify({"team": team, **page})
+
+@app.route("/api/postseason")
+def api_postseason():
+    """
+    Juegos de postemporada, del más reciente al más antiguo:
+    /api/postseason?limit=20&cursor=<next_cursor> -> {games, next_cursor, total}
+    """
+    return _games_page()
+
+@app.route("/api/teams/<team>/games")
+def api_team_games(team):
+    """Igual que /api/postseason, solo los juegos de un equipo."""
+    return _games_page(team)
+
+@app.route("/api/teams/<team>/log")
+def api_team_log(team):
+    """
+    Bitácora de un equipo (juegos que cuentan para su récord), del más
+    reciente al más antiguo: {team, games: [{opponent, home, runs_for, runs_against, result, ...}]}
+    """
+    try:
+        logs = _load_json_cached(TEAM_LOGS_FILE)
+    except Exception as e:
+        return jsonify({"error": f"Failed to read cached data: {e}"}), 500
+    if logs is None:
+        return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+    teams = logs.get("teams") or {}
+    canonical = next((t for t in teams if t.lower() == team.strip().lower()), None)
+    if canonical is None:
+        return jsonify({"error": f"Equipo desconocido: {team}"}), 404
+    return jsonify({"team": canonical, "games": teams[canonical]})
+
+_archive_cache = {}
+
+def _history_for(as_of):
+    """Historial de la temporada vigente o, si as_of es anterior, el archivo comprimido que la cubre."""
+    history = _load_json_cached(HISTORY_FILE)
+    if history is None or as_of >= history["start"]:
+        return history
+    older = [s for s in standings_history.archived_starts() if s <= as_of]
+    if not older:
+        return history
+    start = older[-1]
+    if start not in _archive_cache:
+        _archive_cache[start] = standings_history.load_archive(start)
+    return _archive_cache[start]
+
+@app.route("/api/standings")
+def api_standings():
+    """
+    Tabla actual, o la tabla al cierre de un día: /api/standings?as_of=YYYY-MM-DD
+    """
+    as_of = request.args.get("as_of")
+    try:
+        if not as_of:
+            if not os.path.exists(CACHE_FILE) and _read_shm() is None:
+                return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+            data = _load_snapshot()
+            return jsonify({"as_of": None, "standings": data.get("standings") or []})
+        try:
+            if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", as_of):
+                raise ValueError(as_of)
+            date.fromisoformat(as_of)
+        except ValueError:
+            return jsonify({"error": "Formato de fecha inválido, use YYYY-MM-DD."}), 400
+        history = _history_for(as_of)
+        if history is None:
+            return jsonify({"error": "Data not available yet, please try again in a few minutes."}), 503
+        return jsonify({"as_of": as_of, "season_start": history["start"],
+                        "standings": standings_history.standings_as_of(history, as_of)})
+    except Exception as e:
+        return jsonify({"error": f"Failed to read cached data: {e}"}), 500
+
+def _current_version():
+    snap = _read_shm()
+    if snap is not None:
+        return snap[0]
+    log = _load_json_cached(CHANGES_FILE)
+    return log.get("current") if log else None
+
+def _updater_pid():
+    """Pid del updater solo si su lease está vigente, es de este host y es el mismo proceso."""
+    lease = updater_lock.UpdaterLease(0)
+    holder = lease.holder()
+    if holder is None or holder.get("host") != socket.gethostname() or not lease.holder_alive(holder):
+        return None
+    return holder.get("pid")
+
+@app.route("/api/refresh", methods=["POST"])
+def api_refresh():
+    """
+    Pide al updater un ciclo inmediato y responde 202 sin esperarlo; el
+    cliente sigue con /api/changes?since=<version> hasta ver la nueva.
+    Requiere "Authorization: Bearer <REFRESH_TOKEN>". Pedidos simultáneos se
+    suman al mismo ciclo; pedidos nuevos se limitan a uno cada
+    REFRESH_MIN_INTERVAL_SECONDS.
+    """
+    if not REFRESH_TOKEN:
+        return jsonify({"error": "Refresh disabled."}), 404
+    auth = request.headers.get("Authorization", "")
+    token = auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+    if not hmac.compare_digest(token.encode(), REFRESH_TOKEN.encode()):
+        return jsonify({"error": "Unauthorized."}), 401
+
+    before = _current_version()
+    outcome, retry_after = refresh_trigger.request(_updater_pid())
+    if outcome == "rate_limited":
+        resp = jsonify({"error": "Too many refresh requests.", "version": before})
+        resp.headers["Retry-After"] = str(retry_after)
+        return resp, 429
+    # Si nada cambió, el updater no publica versión nueva: /api/changes seguirá en `before`
+    return jsonify({"status": "pending", "coalesced": outcome == "coalesced", "version": before,
+                    "changes_url": f"/api/changes?since={before}" if before is not None else "/api/changes"}), 202
+
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
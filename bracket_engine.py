@@ -0,0 +1,177 @@
+# bracket_engine.py
+"""
+Motor genérico de playoffs: el bracket se describe como un grafo de series
+(ver update_cache.BRACKET_CONFIG) y se resuelve en orden topológico.
+
+Cada serie define:
+    {"id": "QF1", "best_of": 5, "a": <fuente>, "b": <fuente>}
+y cada fuente es una de:
+    {"seed": 1}           # posición en la tabla (1 = primero)
+    {"winner_of": "WC3"}  # ganador de otra serie
+    {"loser_of": "WC1"}   # perdedor de otra serie
+
+El motor guarda, por serie, la huella de sus entradas (equipos, best_of y
+los juegos entre ese par). En el ciclo siguiente solo se vuelve a resolver
+una serie si esa huella cambió; el resto reutiliza la tarjeta anterior.
+"""
+
+WINS_NEEDED = {1: 1, 3: 2, 5: 3, 7: 4}
+
+
+def _pair_key(a, b):
+    return tuple(sorted([a, b]))
+
+
+def _row_key(r):
+    return (-r.get("points", 0), -r.get("wins", 0), r.get("losses", 0))
+
+
+def _series_summary(a, b, games, best_of):
+    """
+    Cuenta victorias en la pareja (a vs b) sobre `games` (ya filtrados al par).
+    Retorna: dict(status, series_score 'x-y', wins_a, wins_b, winner)
+    """
+    wins_needed = WINS_NEEDED[best_of]
+    wins_a = wins_b = 0
+    for g in games:
+        if g["home_score"] > g["away_score"]:
+            w = g["home_team"]
+        elif g["away_score"] > g["home_score"]:
+            w = g["away_team"]
+        else:
+            continue
+        if w == a:
+            wins_a += 1
+        elif w == b:
+            wins_b += 1
+    if wins_a + wins_b == 0:
+        status, winner = "PENDIENTE", None
+    elif wins_a >= wins_needed:
+        status, winner = "JUGADO", a
+    elif wins_b >= wins_needed:
+        status, winner = "JUGADO", b
+    else:
+        status, winner = "EN CURSO", None
+    return {"status": status, "series_score": f"{wins_a}-{wins_b}", "wins_a": wins_a, "wins_b": wins_b, "winner": winner}
+
+
+def _single_game_card(slot, a, b, games):
+    """Bo1 (Wild Card): muestra el último juego decisivo entre el par."""
+    card = {"id": slot["id"], "home": a, "away": b, "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1}
+    last = None
+    for g in games:
+        if g["home_score"] != g["away_score"]:
+            last = g
+    if last:
+        card["home"], card["away"] = last["home_team"], last["away_team"]
+        card["score"] = f'{last["home_score"]}-{last["away_score"]}'
+        card["status"] = "JUGADO"
+        if last["home_score"] > last["away_score"]:
+            card["winner"], card["loser"] = last["home_team"], last["away_team"]
+        else:
+            card["winner"], card["loser"] = last["away_team"], last["home_team"]
+    return card
+
+
+def _series_card(slot, a, b, games):
+    card = {"id": slot["id"], "home": a, "away": b, "best_of": slot["best_of"]}
+    s = _series_summary(a, b, games, slot["best_of"])
+    card.update({"status": s["status"], "series_score": s["series_score"], "winner": s["winner"]})
+    loser = None
+    if s["winner"]:
+        loser = b if s["winner"] == a else a
+    card["loser"] = loser
+    return card
+
+
+def _toposort(slots):
+    by_id = {s["id"]: s for s in slots}
+    order, state = [], {}
+
+    def visit(sid):
+        if state.get(sid) == "done":
+            return
+        if state.get(sid) == "visiting":
+            raise ValueError(f"Bracket con ciclo en {sid}")
+        state[sid] = "visiting"
+        for side in ("a", "b"):
+            src = by_id[sid][side]
+            dep = src.get("winner_of") or src.get("loser_of")
+            if dep:
+                if dep not in by_id:
+                    raise ValueError(f"{sid} depende de una serie inexistente: {dep}")
+                visit(dep)
+        state[sid] = "done"
+        order.append(by_id[sid])
+
+    for s in slots:
+        visit(s["id"])
+    return order
+
+
+class BracketEngine:
+    def __init__(self, config):
+        """
+        config = {"rounds": [(nombre_ronda, [serie, ...]), ...], "champion_of": "F1"}
+        """
+        self.config = config
+        self.round_of = {}
+        slots = []
+        for round_name, round_slots in config["rounds"]:
+            for slot in round_slots:
+                self.round_of[slot["id"]] = round_name
+                slots.append(slot)
+        self.order = _toposort(slots)
+        self._memo = {}            # id -> (huella de entradas, tarjeta)
+        self.last_evaluated = []   # ids re-resueltos en la última evaluación
+
+    def _resolve(self, src, seeds, cards):
+        if "seed" in src:
+            n = src["seed"]
+            return seeds[n - 1] if 0 < n <= len(seeds) else None, "-"
+        if "winner_of" in src:
+            card = cards[src["winner_of"]]
+            return card.get("winner"), f"Ganador {src['winner_of']}"
+        card = cards[src["loser_of"]]
+        return card.get("loser"), f"Perdedor {src['loser_of']}"
+
+    def evaluate(self, standings_rows, games):
+        """
+        Retorna {nombre_ronda: [tarjeta, ...], "champion": equipo|None}.
+        `games` en orden cronológico.
+        """
+        seeds = [r["team"] for r in sorted(standings_rows, key=_row_key)]
+
+        by_pair = {}
+        for g in games:
+            by_pair.setdefault(_pair_key(g["home_team"], g["away_team"]), []).append(g)
+
+        cards = {}
+        self.last_evaluated = []
+        for slot in self.order:
+            a, a_label = self._resolve(slot["a"], seeds, cards)
+            b, b_label = self._resolve(slot["b"], seeds, cards)
+            pair_games = by_pair.get(_pair_key(a, b), []) if (a and b) else []
+            fingerprint = (a, b, slot["best_of"],
+                           tuple((g.get("id"), g["home_team"], g["home_score"], g["away_score"]) for g in pair_games))
+            memo = self._memo.get(slot["id"])
+            if memo and memo[0] == fingerprint:
+                cards[slot["id"]] = memo[1]
+                continue
+
+            if not (a and b):
+                card = {"id": slot["id"], "home": a or a_label, "away": b or b_label, "best_of": slot["best_of"],
+                        "status": "PENDIENTE", "winner": None, "loser": None}
+                card.update({"score": ""} if slot["best_of"] == 1 else {"series_score": "0-0"})
+            elif slot["best_of"] == 1:
+                card = _single_game_card(slot, a, b, pair_games)
+            else:
+                card = _series_card(slot, a, b, pair_games)
+            self._memo[slot["id"]] = (fingerprint, card)
+            self.last_evaluated.append(slot["id"])
+            cards[slot["id"]] = card
+
+        out = {round_name: [cards[s["id"]] for s in round_slots] for round_name, round_slots in self.config["rounds"]}
+        champ = self.config.get("champion_of")
+        out["champion"] = cards[champ].get("winner") if champ else None
+        return out
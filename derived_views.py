@@ -0,0 +1,61 @@
+# derived_views.py
+"""
+Vistas derivadas del ciclo (standings, juegos de hoy, postemporada,
+brackets, estadísticas, artefactos) como nodos de un grafo con entradas
+hasheadas.
+
+Las fuentes se entregan con su huella (juegos capturados, configuración,
+fecha de Santiago). Cada nodo declara de qué fuentes u otros nodos depende;
+solo se recalcula si cambió la huella de alguna entrada. La huella de un
+nodo es la de su resultado, así que si un nodo se recalcula y da lo mismo,
+sus dependientes tampoco se recalculan.
+
+Los nodos se registran en orden topológico (cada entrada debe existir antes).
+"""
+import hashlib, json
+
+
+def digest(value):
+    body = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ViewGraph:
+    def __init__(self, sources):
+        self.sources = tuple(sources)
+        self.nodes = {}            # nombre -> (entradas, fn)
+        self._memo = {}            # nombre -> (huellas de entradas, valor, huella del valor)
+        self.digests = {}          # huellas de la última ejecución (fuentes y nodos)
+        self.last_computed = []    # nodos recalculados en la última ejecución
+        self.last_changed = []     # ... y cuyo resultado cambió
+
+    def node(self, name, inputs, fn):
+        known = set(self.sources) | set(self.nodes)
+        missing = [i for i in inputs if i not in known]
+        if missing:
+            raise ValueError(f"{name} depende de entradas no registradas: {', '.join(missing)}")
+        self.nodes[name] = (tuple(inputs), fn)
+
+    def run(self, sources):
+        """
+        sources = {nombre: (huella, valor)} para cada fuente declarada.
+        Retorna {nombre: valor} de fuentes y nodos.
+        """
+        values = {k: v for k, (_d, v) in sources.items()}
+        digests = {k: d for k, (d, _v) in sources.items()}
+        self.last_computed, self.last_changed = [], []
+        for name, (inputs, fn) in self.nodes.items():
+            key = tuple(digests[i] for i in inputs)
+            memo = self._memo.get(name)
+            if memo and memo[0] == key:
+                values[name], digests[name] = memo[1], memo[2]
+                continue
+            value = fn(*(values[i] for i in inputs))
+            out = digest(value)
+            if not memo or memo[2] != out:
+                self.last_changed.append(name)
+            self._memo[name] = (key, value, out)
+            values[name], digests[name] = value, out
+            self.last_computed.append(name)
+        self.digests = digests
+        return values
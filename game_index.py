@@ -0,0 +1,79 @@
+# game_index.py
+"""
+Índice ordenado de los juegos de postemporada para paginar por cursor
+(/api/postseason y /api/teams/<team>/games), armado una vez por ciclo en
+update_cache.py.
+
+Archivo (postseason_index.json):
+    {
+      "games":   [juego, ...],          # orden ascendente por (ts, id)
+      "by_team": {team: [pos, ...]},    # posiciones en "games", ascendentes
+    }
+
+Las páginas van del más reciente al más antiguo. El cursor es "ts:id" del
+último juego entregado; la página siguiente son los juegos estrictamente
+anteriores a esa clave (bisect sobre las claves ordenadas).
+"""
+from bisect import bisect_left
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _key(g):
+    return (g["ts"], str(g["id"]))
+
+
+def build_index(games, teams):
+    ordered = sorted(games, key=_key)
+    by_team = {t: [] for t in teams}
+    for pos, g in enumerate(ordered):
+        for t in (g["home_team"], g["away_team"]):
+            if t in by_team:
+                by_team[t].append(pos)
+    return {"games": ordered, "by_team": by_team}
+
+
+def encode_cursor(g):
+    ts, gid = _key(g)
+    return f"{ts}:{gid}"
+
+
+def decode_cursor(cursor):
+    """ "ts:id" -> (ts, id); ValueError si no tiene esa forma."""
+    ts, sep, gid = (cursor or "").partition(":")
+    if not sep or not gid:
+        raise ValueError(cursor)
+    return int(ts), gid
+
+
+class GameIndex:
+    def __init__(self, data):
+        self.games = data.get("games") or []
+        self.by_team = data.get("by_team") or {}
+        self.keys = [_key(g) for g in self.games]
+        self.team_keys = {t: [self.keys[p] for p in pos] for t, pos in self.by_team.items()}
+        self.team_names = {t.lower(): t for t in self.by_team}
+
+    def team(self, name):
+        """Nombre canónico del equipo (sin distinguir mayúsculas), o None."""
+        return self.team_names.get((name or "").strip().lower())
+
+    def page(self, team=None, cursor=None, limit=PAGE_SIZE):
+        """
+        {"games": [...], "next_cursor": "ts:id" | None, "total": n}
+        `team` debe ser un nombre canónico (ver team()).
+        """
+        if team is None:
+            keys, positions = self.keys, None
+        else:
+            keys, positions = self.team_keys.get(team, []), self.by_team.get(team, [])
+        end = len(keys) if cursor is None else bisect_left(keys, decode_cursor(cursor))
+        start = max(0, end - limit)
+        chosen = range(end - 1, start - 1, -1)
+        games = [self.games[positions[i] if positions is not None else i] for i in chosen]
+        return {
+            "games": games,
+            "next_cursor": encode_cursor(games[-1]) if games and start > 0 else None,
+            "total": len(keys),
+        }
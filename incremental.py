@@ -0,0 +1,56 @@
+# incremental.py
+"""
+Base de los agregadores incrementales (team_stats, pitching_stats).
+
+update() compara la entrada con lo ya contado (por clave): los elementos
+nuevos se suman, los que desaparecieron (la ventana de la API avanza, o una
+exclusión) se descuentan y los que cambiaron (p. ej. una corrección de
+marcador) se descuentan y se vuelven a sumar. Nunca se recalcula desde cero,
+así que los acumuladores no pueden depender del orden de llegada.
+
+Cada subclase define _clear() (vacía sus acumuladores) y _fold(item, sign)
+(suma el elemento con sign=1 o lo descuenta con sign=-1).
+"""
+from abc import ABC, abstractmethod
+
+
+def game_key(g):
+    return g.get("id") or f'{g["home_team"]}|{g["away_team"]}|{g["ts"]}'
+
+
+class IncrementalAggregator(ABC):
+    def reset(self):
+        self._clear()
+        self.counted = {}   # clave -> elemento contado
+
+    def _key(self, item):
+        return game_key(item)
+
+    @abstractmethod
+    def _clear(self):
+        """Vacía los acumuladores."""
+
+    @abstractmethod
+    def _fold(self, item, sign):
+        """Suma (sign=1) o descuenta (sign=-1) un elemento."""
+
+    def update(self, items):
+        """
+        `items`: todos los elementos vigentes (no solo los nuevos).
+        Retorna la cantidad de elementos sumados, descontados o reemplazados.
+        """
+        current = {self._key(it): it for it in items}
+        changes = 0
+        for k in [k for k in self.counted if k not in current]:
+            self._fold(self.counted.pop(k), -1)
+            changes += 1
+        for k, it in current.items():
+            old = self.counted.get(k)
+            if old == it:
+                continue
+            if old is not None:
+                self._fold(old, -1)
+            self._fold(it, 1)
+            self.counted[k] = it
+            changes += 1
+        return changes
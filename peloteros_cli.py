@@ -0,0 +1,201 @@
+# peloteros_cli.py
+"""
+Reportes rápidos desde el snapshot local (sin red):
+
+    python peloteros_cli.py standings [--as-of YYYY-MM-DD]
+    python peloteros_cli.py today
+    python peloteros_cli.py games [--date YYYY-MM-DD]
+    python peloteros_cli.py brackets
+    python peloteros_cli.py team "Yankees"
+    python peloteros_cli.py pitching [--team "Yankees"]
+
+Opciones comunes:
+    --format table|json|csv   (table por defecto)
+    --refresh                 corre un ciclo de update_cache antes (consulta la API)
+
+Lee standings_cache.json, games_by_date.json, team_logs.json y
+standings_history.json que deja update_cache.py; no importa requests ni el
+módulo de standings salvo con --refresh (que respeta el lease del updater).
+"""
+import argparse, csv, json, os, re, sys
+from datetime import date
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, "standings_cache.json")
+GAMES_BY_DATE_FILE = os.path.join(BASE_DIR, "games_by_date.json")
+TEAM_LOGS_FILE = os.path.join(BASE_DIR, "team_logs.json")
+
+
+def _load(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        sys.exit(f"No existe {os.path.basename(path)}; corre update_cache.py --once o usa --refresh.")
+
+
+# ========================= REPORTES =========================
+def report_standings(args):
+    if args.as_of:
+        import standings_history
+        history = _load(standings_history.HISTORY_FILE)
+        rows = standings_history.standings_as_of(history, args.as_of)
+    else:
+        rows = _load(CACHE_FILE).get("standings") or []
+    cols = [("pos", "Pos"), ("team", "Equipo"), ("user", "Jugador"), ("played", "JJ"),
+            ("wins", "W"), ("losses", "L"), ("points", "Pts")]
+    return cols, [dict(r, pos=i) for i, r in enumerate(rows, start=1)]
+
+
+def report_today(args):
+    from static_export import parse_game_string
+    games = [parse_game_string(g) for g in _load(CACHE_FILE).get("games_today") or []]
+    cols = [("home_team", "Local"), ("home_score", "C"), ("away_score", "C"), ("away_team", "Visita"),
+            ("ended_at_local", "Fecha")]
+    return cols, games
+
+
+def report_games(args):
+    days = _load(GAMES_BY_DATE_FILE).get("days") or {}
+    if args.date:
+        games = (days.get(args.date) or {}).get("games", [])
+    else:
+        games = [g for d in days.values() for g in d["games"]]
+    cols = [("id", "Id"), ("home_team", "Local"), ("home_score", "C"), ("away_score", "C"),
+            ("away_team", "Visita"), ("ended_at_local", "Fecha")]
+    return cols, games
+
+
+def report_brackets(args):
+    data = _load(CACHE_FILE)
+    br = data.get("bracket8") or {}
+    cards = list(data.get("wildcard_bracket") or [])
+    cards += (br.get("quarters") or []) + (br.get("semis") or []) + ([br["final"]] if br.get("final") else [])
+    for c in cards:
+        c["result"] = c.get("series_score") if c.get("best_of", 1) > 1 else c.get("score")
+    cols = [("id", "Serie"), ("best_of", "Bo"), ("home", "Equipo A"), ("away", "Equipo B"),
+            ("result", "Marcador"), ("status", "Estado"), ("winner", "Ganador")]
+    if br.get("champion"):
+        cards.append({"id": "Campeón", "home": br["champion"]})
+    return cols, cards
+
+
+def report_team(args):
+    # Misma bitácora que /api/teams/<team>/log (juegos que cuentan para el récord)
+    teams = _load(TEAM_LOGS_FILE).get("teams") or {}
+    team = next((t for t in teams if t.lower() == args.team.strip().lower()), None)
+    if team is None:
+        sys.exit(f"Equipo desconocido: {args.team}")
+    rows = []
+    for e in teams[team]:
+        rows.append({
+            "date": e["ended_at_local"],
+            "side": "local" if e["home"] else "visita",
+            "opponent": e["opponent"],
+            "score": f'{e["runs_for"]}-{e["runs_against"]}',
+            "result": e["result"],
+            "ts": e["ts"],
+        })
+    rows.sort(key=lambda r: r["ts"])
+    cols = [("date", "Fecha"), ("side", "L/V"), ("opponent", "Rival"), ("score", "Marcador"), ("result", "R")]
+    return cols, rows
+
+
+def report_pitching(args):
+    pitching = _load(CACHE_FILE).get("pitching") or {}
+    if args.team:
+        team = next((t for t in pitching.get("teams") or {} if t.lower() == args.team.strip().lower()), None)
+        rows = pitching["teams"][team]["pitchers"] if team else []
+    else:
+        rows = (pitching.get("leaders") or {}).get("wins") or []
+    cols = [("name", "Pitcher"), ("team", "Equipo"), ("wins", "W"), ("losses", "L"), ("saves", "SV")]
+    return cols, rows
+
+
+REPORTS = {
+    "standings": report_standings,
+    "today": report_today,
+    "games": report_games,
+    "brackets": report_brackets,
+    "team": report_team,
+    "pitching": report_pitching,
+}
+
+
+def _refresh():
+    """Un ciclo de update_cache, como `update_cache.py --once`: solo si el lease está libre."""
+    import update_cache, updater_lock
+    update_cache._install_wake_signal()
+    interval = int(os.getenv("UPDATE_INTERVAL_SECONDS", "300"))
+    lease = updater_lock.UpdaterLease(ttl_seconds=update_cache.LEASE_SECONDS or 3 * interval)
+    if not lease.try_acquire():
+        holder = (lease.holder() or {}).get("token")
+        sys.exit(f"Otro updater tiene el lease ({holder}); se usa el snapshot vigente sin --refresh.")
+    try:
+        return update_cache._run_cycle()
+    finally:
+        lease.release()
+
+
+def _valid_day(parser, value, option):
+    if value is None:
+        return
+    # Mismo criterio que /api/standings: fromisoformat solo no basta (3.11 acepta "20250901")
+    try:
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", value):
+            raise ValueError(value)
+        date.fromisoformat(value)
+    except ValueError:
+        parser.error(f"{option}: fecha inválida {value!r}, use YYYY-MM-DD")
+
+
+# ========================= SALIDA =========================
+def _print_table(cols, rows):
+    if not rows:
+        print(" — Sin registros —")
+        return
+    cells = [[("" if r.get(k) is None else str(r.get(k))) for k, _h in cols] for r in rows]
+    widths = [max([len(h)] + [len(c[i]) for c in cells]) for i, (_k, h) in enumerate(cols)]
+    print(" | ".join(h.ljust(w) for (_k, h), w in zip(cols, widths)))
+    print("-+-".join("-" * w for w in widths))
+    for c in cells:
+        print(" | ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reportes de PELOTEROS desde el snapshot local.")
+    parser.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    parser.add_argument("--refresh", action="store_true", help="actualizar el snapshot desde la API antes")
+    sub = parser.add_subparsers(dest="report", required=True)
+    p = sub.add_parser("standings", help="tabla de posiciones")
+    p.add_argument("--as-of", help="tabla al cierre de un día (YYYY-MM-DD)")
+    sub.add_parser("today", help="juegos de hoy (hora Chile)")
+    p = sub.add_parser("games", help="juegos por día")
+    p.add_argument("--date", help="YYYY-MM-DD (por defecto, todos)")
+    sub.add_parser("brackets", help="Wild Card y playoffs")
+    p = sub.add_parser("team", help="juegos de un equipo")
+    p.add_argument("team")
+    p = sub.add_parser("pitching", help="líderes de pitcheo (W/L/SV)")
+    p.add_argument("--team", help="pitchers de un equipo")
+    args = parser.parse_args(argv)
+    _valid_day(parser, getattr(args, "as_of", None), "--as-of")
+    _valid_day(parser, getattr(args, "date", None), "--date")
+
+    if args.refresh and not _refresh():
+        return 1
+
+    cols, rows = REPORTS[args.report](args)
+    if args.format == "json":
+        json.dump(rows, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif args.format == "csv":
+        w = csv.DictWriter(sys.stdout, fieldnames=[k for k, _h in cols], extrasaction="ignore")
+        w.writeheader()
+        w.writerows(rows)
+    else:
+        _print_table(cols, rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# pitching_stats.py
+"""
+Líderes de pitcheo a partir de los juegos de la liga, usando el campo
+"pitchers" que deja normalize_game al interpretar display_pitcher_info
+({"win": ..., "loss": ..., "save": ...}). No requiere consultas extra.
+
+El pitcher ganador y el del salvado se acreditan al equipo ganador; el
+perdedor, al equipo perdedor. Solo se acredita un lado si lo jugó el dueño
+del equipo (home_user/away_user de normalize_game), igual que la tabla: los
+pitchers de un equipo que usaba la CPU no cuentan. Un pitcher se identifica
+por (equipo, nombre).
+
+Igual que team_stats, se alimenta incrementalmente (ver incremental.py).
+"""
+from incremental import IncrementalAggregator
+
+TOP_N = 10
+
+
+class PitchingAggregator(IncrementalAggregator):
+    def __init__(self, league_order):
+        self.teams = [team for (_user, team) in league_order]
+        self.team_of = dict(league_order)
+        self.reset()
+
+    def _clear(self):
+        self.pitchers = {}   # (equipo, nombre) -> {"wins", "losses", "saves"}
+
+    def _credit(self, team, name, field, sign):
+        if not name:
+            return
+        rec = self.pitchers.get((team, name))
+        if rec is None:
+            rec = self.pitchers[(team, name)] = {"wins": 0, "losses": 0, "saves": 0}
+        rec[field] += sign
+        if not any(rec.values()):
+            del self.pitchers[(team, name)]
+
+    def _owned(self, team, user):
+        return user is not None and self.team_of.get(user) == team
+
+    def _fold(self, g, sign):
+        """`g`: juego normalizado (con home_user/away_user y "pitchers")."""
+        p = g.get("pitchers") or {}
+        hs, as_ = g["home_score"], g["away_score"]
+        if hs == as_:
+            return
+        home = (g["home_team"], g.get("home_user"))
+        away = (g["away_team"], g.get("away_user"))
+        (w, w_user), (l, l_user) = (home, away) if hs > as_ else (away, home)
+        if self._owned(w, w_user):
+            self._credit(w, p.get("win"), "wins", sign)
+            self._credit(w, p.get("save"), "saves", sign)
+        if self._owned(l, l_user):
+            self._credit(l, p.get("loss"), "losses", sign)
+
+    def snapshot(self):
+        """
+        {"leaders": {"wins": [...], "saves": [...]},
+         "teams": {equipo: {"wins", "losses", "saves", "pitchers": [...]}}}
+        """
+        rows = [{"name": name, "team": team, "decisions": r["wins"] + r["losses"], **r}
+                for (team, name), r in self.pitchers.items()]
+        rows.sort(key=lambda r: (-r["wins"], r["losses"], -r["saves"], r["name"], r["team"]))
+
+        teams = {t: {"wins": 0, "losses": 0, "saves": 0, "pitchers": []} for t in self.teams}
+        for r in rows:
+            t = teams[r["team"]]
+            t["wins"] += r["wins"]
+            t["losses"] += r["losses"]
+            t["saves"] += r["saves"]
+            t["pitchers"].append(r)
+
+        saves = sorted((r for r in rows if r["saves"]), key=lambda r: (-r["saves"], r["name"], r["team"]))
+        return {
+            "leaders": {
+                "wins": [r for r in rows if r["wins"]][:TOP_N],
+                "saves": saves[:TOP_N],
+            },
+            "teams": teams,
+        }
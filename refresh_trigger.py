@@ -0,0 +1,71 @@
+# refresh_trigger.py
+"""
+Refresco a pedido entre la app y update_cache.py.
+
+Un pedido es el archivo REFRESH_FILE, creado con O_EXCL: mientras exista,
+todos los pedidos nuevos se suman al mismo ciclo (singleflight). El updater
+lo detecta en su sondeo (o recibe SIGUSR1), corre un ciclo y lo borra al
+terminar. La app no espera: el cliente sigue /api/changes.
+
+REFRESH_STAMP guarda la hora del último pedido aceptado, para limitar la
+frecuencia (REFRESH_MIN_INTERVAL_SECONDS) entre todos los workers.
+"""
+import json, os, signal, time, uuid
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REFRESH_FILE = os.path.join(BASE_DIR, "refresh_request.json")
+REFRESH_STAMP = os.path.join(BASE_DIR, "refresh_last")
+REFRESH_MIN_INTERVAL_SECONDS = int(os.getenv("REFRESH_MIN_INTERVAL_SECONDS", "60"))
+REFRESH_STALE_SECONDS = 600  # pedido huérfano (updater caído): se descarta
+
+
+def pending():
+    """Contenido del pedido en curso, o None."""
+    try:
+        with open(REFRESH_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def request(updater_pid=None):
+    """
+    Registra un pedido de refresco.
+    Retorna ("created" | "coalesced" | "rate_limited", segundos_para_reintentar).
+    """
+    cur = pending()
+    if cur is not None:
+        if time.time() - cur.get("requested_at", 0) < REFRESH_STALE_SECONDS:
+            return "coalesced", 0
+        complete(cur)
+    try:
+        elapsed = time.time() - os.path.getmtime(REFRESH_STAMP)
+    except OSError:
+        elapsed = None
+    if elapsed is not None and elapsed < REFRESH_MIN_INTERVAL_SECONDS:
+        return "rate_limited", int(REFRESH_MIN_INTERVAL_SECONDS - elapsed) + 1
+    try:
+        fd = os.open(REFRESH_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return "coalesced", 0
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"token": uuid.uuid4().hex, "requested_at": time.time()}, f)
+    with open(REFRESH_STAMP, "w", encoding="utf-8") as f:
+        f.write(str(time.time()))
+    # Despertar al updater de inmediato si está en este host; si no, lo ve en su próximo sondeo
+    if updater_pid and hasattr(signal, "SIGUSR1"):
+        try:
+            os.kill(int(updater_pid), signal.SIGUSR1)
+        except (OSError, ValueError):
+            pass
+    return "created", 0
+
+
+def complete(req):
+    """El updater terminó el ciclo que atendió `req`: libera a los que esperan."""
+    cur = pending()
+    if req and cur and cur.get("token") == req.get("token"):
+        try:
+            os.remove(REFRESH_FILE)
+        except OSError:
+            pass
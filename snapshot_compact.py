@@ -0,0 +1,94 @@
+# snapshot_compact.py
+"""
+Formato compacto (columnar) del snapshot, servido con /api/full?format=compact.
+
+Solo cambia `postseason_games`: en vez de una lista de dicts que repite las
+claves y los nombres completos de los equipos en cada juego, se envía un
+diccionario de equipos y arreglos paralelos:
+
+    "postseason_games": {
+      "format": "columns-v2",
+      "teams": ["Yankees", "Tigers", ...],
+      "id":         ["123", ...],
+      "home":       [0, ...],         # índice en teams
+      "away":       [1, ...],
+      "home_score": [4, ...],
+      "away_score": [2, ...],
+      "ts":         [1758762600, ...],# epoch (s); el cliente arma "dd-mm-yyyy - h:mm pm (hora Chile)"
+      "pitchers":   ["P. Pérez", ...],# nombres de pitchers (campo "pitchers" de cada juego)
+      "win":        [0, ...],         # índice en pitchers, o null
+      "loss":       [null, ...],
+      "save":       [null, ...]
+    }
+"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+FORMAT = "columns-v2"
+PITCHER_ROLES = ("win", "loss", "save")
+SCL = ZoneInfo("America/Santiago")
+
+
+def _interner():
+    names, idx = [], {}
+
+    def _idx(name):
+        i = idx.get(name)
+        if i is None:
+            i = idx[name] = len(names)
+            names.append(name)
+        return i
+    return names, _idx
+
+
+def encode_games(games):
+    teams, team_idx = _interner()
+    pitchers, pitcher_idx = _interner()
+
+    cols = {"id": [], "home": [], "away": [], "home_score": [], "away_score": [], "ts": [],
+            "win": [], "loss": [], "save": []}
+    for g in games:
+        cols["id"].append(g.get("id"))
+        cols["home"].append(team_idx(g["home_team"]))
+        cols["away"].append(team_idx(g["away_team"]))
+        cols["home_score"].append(g["home_score"])
+        cols["away_score"].append(g["away_score"])
+        cols["ts"].append(g.get("ts"))
+        p = g.get("pitchers") or {}
+        for role in PITCHER_ROLES:
+            cols[role].append(pitcher_idx(p[role]) if p.get(role) else None)
+    return {"format": FORMAT, "teams": teams, "pitchers": pitchers, **cols}
+
+
+def decode_games(block):
+    """Inverso de encode_games (para consumidores Python, p. ej. la CLI)."""
+    if isinstance(block, list):
+        return block
+    teams = block["teams"]
+    names = block.get("pitchers")
+    out = []
+    for i, ts in enumerate(block["ts"]):
+        d_local = datetime.fromtimestamp(ts, SCL)
+        try:
+            ended = d_local.strftime("%d-%m-%Y - %-I:%M %p").lower()
+        except Exception:
+            ended = d_local.strftime("%d-%m-%Y - %#I:%M %p").lower()
+        game = {
+            "id": block["id"][i],
+            "home_team": teams[block["home"][i]],
+            "away_team": teams[block["away"][i]],
+            "home_score": block["home_score"][i],
+            "away_score": block["away_score"][i],
+            "ts": ts,
+            "ended_at_local": f"{ended} (hora Chile)",
+        }
+        if names is not None:
+            game["pitchers"] = {r: (names[block[r][i]] if block[r][i] is not None else None) for r in PITCHER_ROLES}
+        out.append(game)
+    return out
+
+
+def compact_payload(payload):
+    out = dict(payload)
+    out["postseason_games"] = encode_games(payload.get("postseason_games") or [])
+    return out
@@ -0,0 +1,142 @@
+# snapshot_delta.py
+"""
+Cambios entre snapshots consecutivos, para /api/changes?since=<version>.
+
+El updater calcula en cada ciclo un delta (from -> to) contra el snapshot
+anterior y guarda los últimos CHANGES_KEEP en standings_changes.json.
+La app encadena los deltas desde la versión del cliente; si esa versión
+ya no está en el historial, responde con el payload completo.
+
+Forma de un delta:
+    {
+      "from": v0, "to": v1, "last_updated": "...",
+      "games_added":   [juego, ...],        # postseason_games nuevos
+      "games_removed": [id, ...],
+      "standings":     [fila, ...],         # filas que cambiaron (por team)
+      "standings_order": [team, ...],       # solo si cambió el orden
+      "cards":         [card, ...],         # WC/QF/SF/F que cambiaron (por id)
+      "champion":      "..." | None,        # solo si cambió
+      "bracket8":      {...} | None,        # solo si aparece/desaparece entero
+      "games_today":   [...],               # solo si cambió
+      "team_stats":    {team: stats, ...},  # equipos cuyas estadísticas cambiaron
+      "pitching":      {...},               # líderes de pitcheo, solo si cambiaron
+    }
+"""
+import json, os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CHANGES_FILE = os.path.join(BASE_DIR, "standings_changes.json")
+CHANGES_KEEP = 48
+
+
+def _cards(payload):
+    cards = list(payload.get("wildcard_bracket") or [])
+    br = payload.get("bracket8") or {}
+    cards += br.get("quarters") or []
+    cards += br.get("semis") or []
+    if br.get("final"):
+        cards.append(br["final"])
+    return {c["id"]: c for c in cards if c.get("id")}
+
+
+def diff_snapshots(prev, cur):
+    """Delta para pasar de `prev` a `cur` (ambos payloads completos)."""
+    delta = {"from": prev.get("version"), "to": cur.get("version"), "last_updated": cur.get("last_updated")}
+
+    prev_games = {g["id"]: g for g in prev.get("postseason_games") or [] if g.get("id")}
+    cur_games = {g["id"]: g for g in cur.get("postseason_games") or [] if g.get("id")}
+    delta["games_added"] = [g for gid, g in cur_games.items() if prev_games.get(gid) != g]
+    delta["games_removed"] = [gid for gid in prev_games if gid not in cur_games]
+
+    prev_rows = {r["team"]: r for r in prev.get("standings") or []}
+    cur_rows = cur.get("standings") or []
+    delta["standings"] = [r for r in cur_rows if prev_rows.get(r["team"]) != r]
+    cur_order = [r["team"] for r in cur_rows]
+    if cur_order != [r["team"] for r in prev.get("standings") or []]:
+        delta["standings_order"] = cur_order
+
+    prev_br, cur_br = prev.get("bracket8"), cur.get("bracket8")
+    if (prev_br is None) != (cur_br is None):
+        delta["bracket8"] = cur_br
+    elif cur_br and prev_br.get("champion") != cur_br.get("champion"):
+        delta["champion"] = cur_br.get("champion")
+    prev_cards = _cards(prev)
+    delta["cards"] = [c for cid, c in _cards(cur).items() if prev_cards.get(cid) != c]
+
+    prev_stats = prev.get("team_stats") or {}
+    delta["team_stats"] = {t: st for t, st in (cur.get("team_stats") or {}).items() if prev_stats.get(t) != st}
+
+    if prev.get("pitching") != cur.get("pitching"):
+        delta["pitching"] = cur.get("pitching")
+    if prev.get("games_today") != cur.get("games_today"):
+        delta["games_today"] = cur.get("games_today") or []
+    return delta
+
+
+def merge_deltas(deltas):
+    """Combina una cadena de deltas consecutivos en uno solo (el último gana)."""
+    added, removed, rows, cards, stats = {}, [], {}, {}, {}
+    out = {}
+    for d in deltas:
+        for gid in d["games_removed"]:
+            if added.pop(gid, None) is None:
+                removed.append(gid)
+        for g in d["games_added"]:
+            added[g["id"]] = g
+        for r in d["standings"]:
+            rows[r["team"]] = r
+        for c in d["cards"]:
+            cards[c["id"]] = c
+        stats.update(d.get("team_stats") or {})
+        for k in ("standings_order", "bracket8", "champion", "games_today", "pitching"):
+            if k in d:
+                out[k] = d[k]
+        if "bracket8" in d:
+            out.pop("champion", None)
+    out.update({
+        "from": deltas[0]["from"] if deltas else None,
+        "to": deltas[-1]["to"] if deltas else None,
+        "last_updated": deltas[-1]["last_updated"] if deltas else None,
+        "games_added": list(added.values()),
+        "games_removed": removed,
+        "standings": list(rows.values()),
+        "cards": list(cards.values()),
+        "team_stats": stats,
+    })
+    return out
+
+
+def changes_since(log, since):
+    """
+    Retorna el delta combinado desde `since` hasta la versión actual del log,
+    o None si `since` ya no está en el historial (el cliente debe recargar todo).
+    """
+    deltas = log.get("deltas") or []
+    if since == log.get("current"):
+        return merge_deltas([]) | {"from": since, "to": since}
+    for i, d in enumerate(deltas):
+        if d["from"] == since:
+            return merge_deltas(deltas[i:])
+    return None
+
+
+def append_delta(prev, cur, path=CHANGES_FILE, keep=CHANGES_KEEP):
+    """Agrega el delta prev -> cur al log en disco (escritura atómica)."""
+    log = {"current": None, "deltas": []}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            log = json.load(f)
+    except (OSError, ValueError):
+        pass
+    deltas = log.get("deltas") or []
+    if prev is not None and prev.get("version") is not None:
+        # Si el log quedó cortado (reinicio), la cadena vieja ya no sirve
+        if deltas and deltas[-1]["to"] != prev.get("version"):
+            deltas = []
+        deltas.append(diff_snapshots(prev, cur))
+    log = {"current": cur.get("version"), "deltas": deltas[-keep:]}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(log, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return log
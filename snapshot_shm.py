@@ -0,0 +1,97 @@
+# snapshot_shm.py
+"""
+Entrega del snapshot entre update_cache.py y los workers de gunicorn
+mediante un archivo mapeado en memoria (mmap).
+
+Formato del archivo:
+    [ MAGIC (8 bytes) | version (uint64) | largo (uint64) | JSON serializado ]
+
+El updater publica cada snapshot (y su variante compacta, la que pide la
+página con /api/full?format=compact, en SHM_COMPACT_FILE) en un archivo
+temporal y lo reemplaza de forma atómica (os.replace). Los workers lo mapean en solo lectura y sirven
+los bytes tal cual, sin volver a parsear el JSON; solo se vuelve a mapear
+cuando cambia el archivo (y con él la versión del encabezado).
+"""
+import mmap, os, struct, threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SHM_FILE = os.getenv("SNAPSHOT_SHM_FILE") or os.path.join(BASE_DIR, "standings_cache.shm")
+SHM_COMPACT_FILE = os.getenv("SNAPSHOT_SHM_COMPACT_FILE") or os.path.join(BASE_DIR, "standings_cache_compact.shm")
+SHM_ENABLED = os.getenv("SNAPSHOT_SHM") == "1"
+
+MAGIC = b"PLTSNAP1"
+HEADER = struct.Struct("<8sQQ")
+
+
+def publish(body: bytes, version: int, path: str = SHM_FILE):
+    """
+    Escribe el snapshot con su encabezado de versión y lo deja visible
+    de forma atómica. Los lectores que ya tengan mapeado el archivo
+    anterior siguen leyendo su copia hasta que detecten el cambio.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, int(version), len(body)))
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def published_version(path: str = SHM_FILE):
+    """Versión del snapshot publicado en `path`, o None si no hay uno válido."""
+    try:
+        with open(path, "rb") as f:
+            magic, version, _length = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return version if magic == MAGIC else None
+
+
+class SnapshotReader:
+    """
+    Lector compartido por los threads de un worker. Guarda el mapeo
+    vigente como una tupla inmutable (clave_stat, mmap, version, largo)
+    para que cada request tome una referencia consistente sin bloquear;
+    el lock solo se usa al re-mapear.
+    """
+
+    def __init__(self, path: str = SHM_FILE):
+        self.path = path
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _stat_key(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _remap(self, key):
+        with self._lock:
+            state = self._state
+            if state is not None and state[0] == key:
+                return state
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, length = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or HEADER.size + length > len(mm):
+                mm.close()
+                raise ValueError(f"Snapshot inválido en {self.path}")
+            # El mmap anterior se libera cuando ningún request lo referencia
+            self._state = (key, mm, version, length)
+            return self._state
+
+    def read(self):
+        """
+        Retorna (version, bytes_json) o None si aún no hay snapshot publicado.
+        """
+        key = self._stat_key()
+        if key is None:
+            return None
+        state = self._state
+        if state is None or state[0] != key:
+            state = self._remap(key)
+        _key, mm, version, length = state
+        return version, mm[HEADER.size:HEADER.size + length]
@@ -1,6 +1,7 @@
 # === INICIO DEL ARCHIVO SIN CAMBIOS EN TU LÓGICA EXISTENTE ===
-import requests, time, re, os, json
-from datetime import datetime
+import requests, time, re, os, json, sys, hashlib, queue, threading
+from functools import lru_cache
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo  # ← ADITIVO (necesario para TZ en funciones nuevas y/o existentes)
 
 MODE = "ONLINE"
@@ -56,6 +57,7 @@ else:
     STOP_AFTER_N = conf["STOP_AFTER_N"]
 
 DAY_WINDOW_MODE = conf["DAY_WINDOW_MODE"]
+SPORTS_DAY_CUTOFF_HOUR = 5  # modo "sports": lo jugado antes de esta hora cuenta para el día anterior
 
 API = "https://mlb25.theshow.com/apis/game_history.json"
 PLATFORM = "psn"
@@ -64,6 +66,7 @@ SINCE = datetime(2025, 9, 24)  # ← usaremos esta fecha como inicio de Postempo
 PAGES = (1, 2)
 TIMEOUT = 20
 RETRIES = 2
+FETCH_PREFETCH = int(os.getenv("FETCH_PREFETCH", "2"))  # páginas descargadas por adelantado (0 = sin hilo)
 
 PRINT_DETAILS = False
 STOP_AFTER_N = None
@@ -125,15 +128,47 @@ TEAM_RECORD_ADJUSTMENTS = {
 
 TEAM_POINT_ADJUSTMENTS = {}
 
-LEAGUE_USERS = {u for (u, _t) in LEAGUE_ORDER}
-for base, alts in FETCH_ALIASES.items():
-    LEAGUE_USERS.add(base)
-    LEAGUE_USERS.update(alts)
-LEAGUE_USERS.update({"AiramReynoso_", "Yosoyreynoso_"})
-LEAGUE_USERS_NORM = {u.lower() for u in LEAGUE_USERS}
+# Exclusiones declaradas como datos. Cada regla identifica el juego por "id",
+# o por equipos + día local (YYYY-MM-DD, hora Chile), con marcador y hora (HH:MM) opcionales.
+GAME_EXCLUSIONS = [
+    {
+        "home_team": "Yankees",
+        "away_team": "Mets",
+        "home_score": 0,
+        "away_score": 0,
+        "date": "2025-09-08",
+        "time": "21:40",
+        "reason": "juego 0-0 sin disputar",
+    },
+]
+
+# Correcciones manuales por id de juego (se aplican antes de las exclusiones):
+#   "123456": {"home_score": 3, "away_score": 2}
+GAME_OVERRIDES = {}
+
+EXTRA_LEAGUE_USERS = ("AiramReynoso_", "Yosoyreynoso_")  # miembros sin equipo propio
 
 BXX_RE = re.compile(r"\^(b\d+)\^", flags=re.IGNORECASE)
 
+def _build_identity_index():
+    """
+    Nombre PSN normalizado (sin ^bNN^, minúsculas) -> (usuario canónico, equipo).
+    Incluye LEAGUE_ORDER, todos los FETCH_ALIASES y EXTRA_LEAGUE_USERS (equipo None).
+    """
+    team_by_user = dict(LEAGUE_ORDER)
+    index = {}
+    for user, team in LEAGUE_ORDER:
+        index[sys.intern(user.lower())] = (sys.intern(user), sys.intern(team))
+    for base, alts in FETCH_ALIASES.items():
+        ident = (sys.intern(base), team_by_user.get(base))
+        for name in [base] + alts:
+            index.setdefault(sys.intern(name.lower()), ident)
+    for user in EXTRA_LEAGUE_USERS:
+        index.setdefault(sys.intern(user.lower()), (sys.intern(user), None))
+    return index
+
+IDENTITY_INDEX = _build_identity_index()
+
 def _safe_name(s: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", s or "")
 
@@ -146,13 +181,30 @@ def _dump_json(filename: str, data):
         json.dump(data, f, ensure_ascii=False, indent=2)
     return path
 
+@lru_cache(maxsize=4096)
 def normalize_user_for_compare(raw: str) -> str:
     if not raw: return ""
-    return BXX_RE.sub("", raw).strip().lower()
+    if "^" in raw:
+        raw = BXX_RE.sub("", raw)
+    return sys.intern(raw.strip().lower())
 
 def is_cpu(raw: str) -> bool:
     return normalize_user_for_compare(raw) == "cpu"
 
+def resolve_identity(raw: str):
+    """(usuario canónico, equipo) para cualquier nombre PSN crudo, o None si no es de la liga."""
+    return IDENTITY_INDEX.get(normalize_user_for_compare(raw))
+
+def is_league_matchup(home_name_raw: str, away_name_raw: str) -> bool:
+    """Miembro vs miembro, o CPU vs miembro."""
+    h_mem = resolve_identity(home_name_raw) is not None
+    a_mem = resolve_identity(away_name_raw) is not None
+    return (h_mem and a_mem) or (is_cpu(home_name_raw) and a_mem) or (is_cpu(away_name_raw) and h_mem)
+
+def usernames_for(username_exact: str):
+    """Nombre principal + aliases: todo lo que hay que consultar para un miembro."""
+    return [username_exact] + FETCH_ALIASES.get(username_exact, [])
+
 def parse_date(s: str):
     for fmt in ("%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M"):
         try:
@@ -189,35 +241,250 @@ def dedup_by_id(gs):
 def norm_team(s: str) -> str:
     return (s or "").strip().lower()
 
+TZ_SCL = ZoneInfo("America/Santiago")
+TZ_UTC = ZoneInfo("UTC")
+
+def format_ended_local(d_local) -> str:
+    try:
+        ended = d_local.strftime("%d-%m-%Y - %-I:%M %p").lower()
+    except Exception:
+        ended = d_local.strftime("%d-%m-%Y - %#I:%M %p").lower()
+    return f"{ended} (hora Chile)"
+
+# "W: J. Pérez (2-1), L: A. Soto, S: R. Díaz" (separadores , ; | <br> o salto de línea)
+PITCHER_RE = re.compile(
+    r"\b(W|L|S|SV)\s*:\s*(.+?)\s*(?=[,;|\n]|<br\s*/?>|\b(?:W|L|S|SV)\s*:|$)",
+    flags=re.IGNORECASE,
+)
+PITCHER_RECORD_RE = re.compile(r"\s*\([^)]*\)\s*$")
+PITCHER_ROLES = {"W": "win", "L": "loss", "S": "save", "SV": "save"}
+
+@lru_cache(maxsize=4096)
+def _parse_pitcher_info(info: str):
+    out = {"win": None, "loss": None, "save": None}
+    for role, name in PITCHER_RE.findall(info or ""):
+        name = PITCHER_RECORD_RE.sub("", name).strip()
+        if name:
+            out[PITCHER_ROLES[role.upper()]] = sys.intern(name)
+    return tuple(out.items())
+
+def parse_pitcher_info(info: str) -> dict:
+    """display_pitcher_info -> {"win": nombre|None, "loss": ..., "save": ...}"""
+    return dict(_parse_pitcher_info(info))
+
+def compile_exclusions(rules):
+    """
+    Índice de GAME_EXCLUSIONS: {"id": {gid: regla}, "pair_day": {(equipos, día): [reglas]}}.
+    Así cada juego se revisa con una o dos búsquedas en dict.
+    """
+    by_id, by_pair_day = {}, {}
+    for rule in rules:
+        if rule.get("id"):
+            by_id[str(rule["id"])] = rule
+        else:
+            key = (tuple(sorted((rule["home_team"], rule["away_team"]))), rule["date"])
+            by_pair_day.setdefault(key, []).append(rule)
+    return {"id": by_id, "pair_day": by_pair_day}
+
+EXCLUSION_INDEX = compile_exclusions(GAME_EXCLUSIONS)
+
+def is_excluded(game) -> bool:
+    """`game` normalizado (ver normalize_game)."""
+    if game["id"] and game["id"] in EXCLUSION_INDEX["id"]:
+        return True
+    key = (tuple(sorted((game["home_team"], game["away_team"]))), game["d_local"].strftime("%Y-%m-%d"))
+    for rule in EXCLUSION_INDEX["pair_day"].get(key, ()):
+        if rule["home_team"] != game["home_team"]:
+            continue
+        if "home_score" in rule and rule["home_score"] != game["home_score"]:
+            continue
+        if "away_score" in rule and rule["away_score"] != game["away_score"]:
+            continue
+        if "time" in rule and rule["time"] != game["d_local"].strftime("%H:%M"):
+            continue
+        return True
+    return False
+
+def normalize_game(g):
+    """
+    Etapa única de normalización para todos los pipelines (standings, hoy,
+    postemporada, brackets): dict crudo de la API -> dict normalizado, o None
+    si no es del modo de la liga, no tiene fecha válida o está excluido.
+    Aplica GAME_OVERRIDES antes de revisar exclusiones.
+    """
+    if (g.get("game_mode") or "").strip().upper() != MODE:
+        return None
+    d = parse_date(g.get("display_date", ""))
+    if not d:
+        return None
+    d_local = d.replace(tzinfo=TZ_UTC).astimezone(TZ_SCL)
+    gid = str(g.get("id") or "")
+    try:
+        home_score = int(g.get("home_runs") or 0)
+        away_score = int(g.get("away_runs") or 0)
+    except (ValueError, TypeError):
+        print(f"[WARN] juego {gid or '?'} con marcador inválido ({g.get('home_runs')!r}-{g.get('away_runs')!r}); se omite")
+        return None
+    game = {
+        "id": gid,
+        "dt": d,  # naive (UTC de la API), comparable con SINCE
+        "d_local": d_local,
+        "ts": int(d_local.timestamp()),
+        "ended_at_local": format_ended_local(d_local),
+        "home_team": (g.get("home_full_name") or "").strip(),
+        "away_team": (g.get("away_full_name") or "").strip(),
+        "home_name": g.get("home_name", ""),
+        "away_name": g.get("away_name", ""),
+        # usuario canónico de cada lado (None = CPU / no miembro); lo usa pitching_stats
+        "home_user": (resolve_identity(g.get("home_name", "")) or (None,))[0],
+        "away_user": (resolve_identity(g.get("away_name", "")) or (None,))[0],
+        "home_score": home_score,
+        "away_score": away_score,
+        "home_result": (g.get("home_display_result") or "").strip().upper(),
+        "away_result": (g.get("away_display_result") or "").strip().upper(),
+        "pitcher_info": (g.get("display_pitcher_info") or "").strip(),
+        "pitchers": parse_pitcher_info((g.get("display_pitcher_info") or "").strip()),
+        "raw": g,
+    }
+    override = GAME_OVERRIDES.get(gid) if gid else None
+    if override:
+        game.update(override)
+        if "home_score" in override or "away_score" in override:
+            hs, as_ = game["home_score"], game["away_score"]
+            game["home_result"] = "W" if hs > as_ else ("L" if hs < as_ else "")
+            game["away_result"] = "W" if as_ > hs else ("L" if as_ < hs else "")
+    if is_excluded(game):
+        return None
+    return game
+
+def iter_normalized(raw_games):
+    for g in raw_games:
+        n = normalize_game(g)
+        if n is not None:
+            yield n
+
+# ===== DEDUP (huella canónica) =====
+# El mismo juego aparece en el historial de ambos jugadores y de sus aliases,
+# a veces con ids distintos. Dos juegos son el mismo si coinciden equipos,
+# marcador y pitchers y terminaron dentro de la misma ventana de tiempo.
+DEDUP_WINDOW_SECONDS = 15 * 60
+DEDUP_AUDIT_KEEP = 200
+
+# huella -> (id canónico (el primero visto), ts del juego); persiste entre
+# ciclos (y reinicios, vía dedup_audit.json) para que el id que sobrevive no
+# dependa del orden de captura. Se poda con prune_fingerprint_ids().
+FINGERPRINT_IDS = {}
+DEDUP_COLLISIONS = {}   # (huella, id descartado) -> detalle, para auditoría
+
+def _fingerprint(g, bucket):
+    p = g["pitchers"]
+    pitchers = (p["win"], p["loss"], p["save"]) if any(p.values()) else g["pitcher_info"].lower()
+    key = f'{g["home_team"]}|{g["away_team"]}|{g["home_score"]}|{g["away_score"]}|{bucket}|{pitchers}'
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+def game_fingerprints(g):
+    """(huella propia, huellas de las ventanas vecinas) de un juego normalizado."""
+    b = g["ts"] // DEDUP_WINDOW_SECONDS
+    return _fingerprint(g, b), (_fingerprint(g, b - 1), _fingerprint(g, b + 1))
+
+def _record_collision(pipeline, own, g, kept_id, kept_fp):
+    gid = g["id"]
+    if not gid or gid == kept_id or (own, gid) in DEDUP_COLLISIONS:
+        return
+    if len(DEDUP_COLLISIONS) >= DEDUP_AUDIT_KEEP:
+        DEDUP_COLLISIONS.pop(next(iter(DEDUP_COLLISIONS)))
+    DEDUP_COLLISIONS[(own, gid)] = {
+        "pipeline": pipeline,
+        "fingerprint": kept_fp,
+        "kept_id": kept_id,
+        "dropped_id": gid,
+        "game": f'{g["home_team"]} {g["home_score"]} - {g["away_team"]} {g["away_score"]}',
+        "ended_at_local": g["ended_at_local"],
+    }
+
+def dedup_games(games, pipeline="", on_duplicate=None):
+    """
+    Filtra duplicados de una secuencia de juegos normalizados: primero por id
+    y luego por huella (ventana propia y vecinas, para no cortar en el borde).
+    Agrega g["fingerprint"]; los duplicados con otro id quedan en DEDUP_COLLISIONS.
+    on_duplicate(g, (id, huella) del conservado) se llama por cada duplicado descartado.
+    """
+    seen_ids = {}   # id -> (id, huella) del juego conservado en esta pasada
+    seen = {}       # huella -> (id, huella) del juego conservado en esta pasada
+    for g in games:
+        gid = g["id"]
+        if gid and gid in seen_ids:
+            if on_duplicate:
+                on_duplicate(g, seen_ids[gid])
+            continue
+        own, near = game_fingerprints(g)
+        kept = seen.get(own) or seen.get(near[0]) or seen.get(near[1])
+        if kept is not None:
+            if on_duplicate:
+                on_duplicate(g, kept)
+            _record_collision(pipeline, own, g, *kept)
+            continue
+        entry = FINGERPRINT_IDS.get(own) or FINGERPRINT_IDS.get(near[0]) or FINGERPRINT_IDS.get(near[1])
+        canonical = entry[0] if entry else None
+        if canonical is None and gid:
+            FINGERPRINT_IDS[own] = (gid, g["ts"])
+            canonical = gid
+        if canonical and canonical != gid:
+            # Llega primero con otro id: se conserva con el canónico
+            _record_collision(pipeline, own, g, canonical, own)
+            g["id"] = canonical
+        g["fingerprint"] = own
+        seen[own] = (g["id"], own)
+        if gid:
+            seen_ids[gid] = seen[own]
+        yield g
+
+def dedup_report():
+    """Colisiones detectadas (mismo juego con otro id), más recientes al final."""
+    return list(DEDUP_COLLISIONS.values())
+
+def fingerprint_ids():
+    """{huella: [id canónico, ts]} para persistir (ver load_fingerprint_ids)."""
+    return {fp: [gid, ts] for fp, (gid, ts) in FINGERPRINT_IDS.items()}
+
+def load_fingerprint_ids(data):
+    """Restaura ids canónicos guardados por fingerprint_ids() (p. ej. tras un reinicio)."""
+    for fp, entry in (data or {}).items():
+        try:
+            gid, ts = entry
+            FINGERPRINT_IDS.setdefault(fp, (str(gid), int(ts)))
+        except (TypeError, ValueError):
+            continue
+
+def prune_fingerprint_ids(oldest_ts):
+    """
+    Olvida las huellas de juegos anteriores al horizonte capturado (`oldest_ts`,
+    el juego más antiguo del ciclo) menos la ventana de dedup: ya no vuelven a
+    aparecer en el historial, así que no pueden chocar con uno nuevo.
+    """
+    limit = oldest_ts - DEDUP_WINDOW_SECONDS
+    for fp in [fp for fp, (_gid, ts) in FINGERPRINT_IDS.items() if ts < limit]:
+        del FINGERPRINT_IDS[fp]
+
 def compute_team_record_for_user(username_exact: str, team_name: str):
     pages_raw = []
-    usernames_to_fetch = [username_exact] + FETCH_ALIASES.get(username_exact, [])
-    for uname in usernames_to_fetch:
+    for uname in usernames_for(username_exact):
         for p in PAGES:
             page_items = fetch_page(uname, p)
             pages_raw += page_items
             if PRINT_CAPTURE_LIST:
                 for g in page_items:
                     print(f"    [cap] {uname} p{p} id={g.get('id')}  {g.get('away_full_name','')} @ {g.get('home_full_name','')}  {g.get('display_date','')}")
-    pages_dedup = dedup_by_id(pages_raw)
+    unique = list(dedup_games(iter_normalized(pages_raw), "team_record"))
+    pages_dedup = [g["raw"] for g in unique]
     considered = []
-    for g in pages_dedup:
-        if (g.get("game_mode") or "").strip().upper() != MODE:
+    for g in unique:
+        if g["dt"] < SINCE:
             continue
-        d = parse_date(g.get("display_date",""))
-        if not d or d < SINCE:
-            continue
-        home = (g.get("home_full_name") or "").strip()
-        away = (g.get("away_full_name") or "").strip()
+        home, away = g["home_team"], g["away_team"]
         if norm_team(team_name) not in (norm_team(home), norm_team(away)):
             continue
-        home_name_raw = g.get("home_name","")
-        away_name_raw = g.get("away_name","")
-        h_norm = normalize_user_for_compare(home_name_raw)
-        a_norm = normalize_user_for_compare(away_name_raw)
-        h_mem = h_norm in LEAGUE_USERS_NORM
-        a_mem = a_norm in LEAGUE_USERS_NORM
-        if not ( (h_mem and a_mem) or (is_cpu(home_name_raw) and a_mem) or (is_cpu(away_name_raw) and h_mem) ):
+        if not is_league_matchup(g["home_name"], g["away_name"]):
             continue
         considered.append(g)
     if PRINT_CAPTURE_SUMMARY:
@@ -226,27 +493,35 @@ def compute_team_record_for_user(username_exact: str, team_name: str):
         base = _safe_name(username_exact)
         _dump_json(f"{base}_raw.json", pages_raw)
         _dump_json(f"{base}_dedup.json", pages_dedup)
-        _dump_json(f"{base}_considered.json", considered)
+        _dump_json(f"{base}_considered.json", [g["raw"] for g in considered])
     wins = losses = 0
     detail_lines = []
     for g in considered:
-        home = (g.get("home_full_name") or "").strip()
-        away = (g.get("away_full_name") or "").strip()
-        hr = (g.get("home_display_result") or "").strip().upper()
-        ar = (g.get("away_display_result") or "").strip().upper()
-        dt = g.get("display_date","")
-        if hr == "W":
-            win, lose = home, away
-        elif ar == "W":
-            win, lose = away, home
-        else:
-            continue
-        if norm_team(win) == norm_team(team_name):
-            wins += 1
-        elif norm_team(lose) == norm_team(team_name):
-            losses += 1
-        if PRINT_DETAILS:
-            detail_lines.append(f"{dt}  {away} @ {home} -> ganó {win}")
+        w, l, line = _decision_for(g, team_name)
+        wins += w
+        losses += l
+        if line and PRINT_DETAILS:
+            detail_lines.append(line)
+    return _standings_row(username_exact, team_name, wins, losses, detail_lines)
+
+def _decision_for(g, team_name):
+    """(+W, +L, línea de detalle) del juego para `team_name`; (0, 0, None) si no hubo ganador."""
+    home, away = g["home_team"], g["away_team"]
+    hr, ar = g["home_result"], g["away_result"]
+    if hr == "W":
+        win, lose = home, away
+    elif ar == "W":
+        win, lose = away, home
+    else:
+        return 0, 0, None
+    line = f'{g["raw"].get("display_date","")}  {away} @ {home} -> ganó {win}'
+    if norm_team(win) == norm_team(team_name):
+        return 1, 0, line
+    if norm_team(lose) == norm_team(team_name):
+        return 0, 1, line
+    return 0, 0, line
+
+def _standings_row(username_exact, team_name, wins, losses, detail_lines):
     adj_w, adj_l = TEAM_RECORD_ADJUSTMENTS.get(team_name, (0, 0))
     wins_adj, losses_adj = wins + adj_w, losses + adj_l
     scheduled = 34
@@ -339,75 +614,236 @@ def compute_rows():
     return rows
 
 
-def games_played_today_scl():
-    # Import local para no alterar tus imports globales
-    from zoneinfo import ZoneInfo
-
-    tz_scl = ZoneInfo("America/Santiago")
-    tz_utc = ZoneInfo("UTC")
-
-    # Ventana del DÍA ACTUAL en Santiago
-    now_scl = datetime.now(tz_scl)
-    day_start = now_scl.replace(hour=0, minute=0, second=0, microsecond=0)
-    day_end   = day_start.replace(hour=23, minute=59, second=59, microsecond=999999)
-
-    all_pages = []
-    for username_exact, _team in LEAGUE_ORDER:
-        for p in PAGES:
-            all_pages += fetch_page(username_exact, p)
-
-    seen_ids = set()
-    seen_keys = set()
-    items = []
-    valid_teams = {team for (_user, team) in LEAGUE_ORDER}
-
-    for g in dedup_by_id(all_pages):
-        if (g.get("game_mode") or "").strip().upper() != MODE:
-            continue
-
-        d = parse_date(g.get("display_date", ""))
-        if not d:
-            continue
+def day_key_scl(d_local, mode=None):
+    """
+    Día (YYYY-MM-DD, hora Chile) al que pertenece un juego.
+    "calendar": corte a medianoche. "sports": corte a SPORTS_DAY_CUTOFF_HOUR.
+    """
+    if (mode or DAY_WINDOW_MODE) == "sports" and d_local.hour < SPORTS_DAY_CUTOFF_HOUR:
+        d_local = d_local - timedelta(days=1)
+    return d_local.strftime("%Y-%m-%d")
 
-        # normaliza a UTC si viene naive, luego pasa a Santiago
-        if d.tzinfo is None:
-            d = d.replace(tzinfo=tz_utc)
-        d_local = d.astimezone(tz_scl)
 
-        # ⛔️ filtro: SOLO hoy (Santiago)
-        if not (day_start <= d_local <= day_end):
+def _day_summary(games):
+    record = {}
+    for g in games:
+        if g["home_score"] == g["away_score"]:
             continue
+        win, lose = (g["home_team"], g["away_team"]) if g["home_score"] > g["away_score"] else (g["away_team"], g["home_team"])
+        record.setdefault(win, [0, 0])[0] += 1
+        record.setdefault(lose, [0, 0])[1] += 1
+    return {
+        "games": len(games),
+        "runs": sum(g["home_score"] + g["away_score"] for g in games),
+        "first": games[0]["ended_at_local"] if games else None,
+        "last": games[-1]["ended_at_local"] if games else None,
+        "teams": {t: {"wins": w, "losses": l} for t, (w, l) in sorted(record.items())},
+    }
 
-        home = (g.get("home_full_name") or "").strip()
-        away = (g.get("away_full_name") or "").strip()
-        if home not in valid_teams or away not in valid_teams:
-            continue
 
-        gid = str(g.get("id") or "")
-        if gid and gid in seen_ids:
-            continue
+# ===== PIPELINE (una sola pasada por la API en cada ciclo) =====
+def iter_league_raw(prefetch=None):
+    """
+    Juegos crudos de toda la liga (usuarios + aliases, PAGES), página por
+    página: genera (usuario de la liga, juego). Con prefetch > 0 un hilo
+    descarga las páginas siguientes mientras se procesa la actual.
+    """
+    jobs = [(user, uname, p) for user, _team in LEAGUE_ORDER for uname in usernames_for(user) for p in PAGES]
+    depth = FETCH_PREFETCH if prefetch is None else prefetch
+    if depth <= 0:
+        for user, uname, p in jobs:
+            for g in fetch_page(uname, p):
+                yield user, g
+        return
 
-        hr = str(g.get("home_runs") or "0")
-        ar = str(g.get("away_runs") or "0")
-        pitcher_info = (g.get("display_pitcher_info") or "").strip()
-        canon_key = (home, away, hr, ar, pitcher_info)
-        if canon_key in seen_keys:
-            continue
+    pages = queue.Queue(maxsize=depth)
+    stop = threading.Event()
 
-        if gid:
-            seen_ids.add(gid)
-        seen_keys.add(canon_key)
-
-        # formato de salida igual que el tuyo
+    def worker():
         try:
-            fecha_hora = d_local.strftime("%d-%m-%Y - %-I:%M %p").lower()
-        except Exception:
-            fecha_hora = d_local.strftime("%d-%m-%Y - %#I:%M %p").lower()
+            for user, uname, p in jobs:
+                if stop.is_set():
+                    break
+                pages.put((user, fetch_page(uname, p)))
+        finally:
+            pages.put(None)
+
+    t = threading.Thread(target=worker, name="fetch-pages", daemon=True)
+    t.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is None:
+                break
+            user, items = item
+            for g in items:
+                yield user, g
+    finally:
+        # Si el consumidor corta antes, liberar al hilo (puede estar bloqueado en put)
+        stop.set()
+        while t.is_alive():
+            try:
+                pages.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+def iter_league_games(pipeline="", on_duplicate=None, prefetch=None):
+    """Juegos normalizados y deduplicados de toda la liga; g["source"] = usuario cuyo historial lo trajo."""
+    def normalized():
+        for user, raw in iter_league_raw(prefetch):
+            g = normalize_game(raw)
+            if g is not None:
+                g["source"] = user
+                yield g
+    return dedup_games(normalized(), pipeline, on_duplicate)
+
+class LeagueCycle:
+    """
+    Acumuladores de un ciclo, alimentados juego a juego desde el stream:
+      - récord W/L por equipo (mismos criterios que compute_team_record_for_user:
+        solo juegos del historial del propio usuario o sus aliases)
+      - índice de juegos por día (build_games_by_day)
+      - juegos de postemporada (desde SINCE, duelos de la liga)
+      - bitácora por equipo de los juegos que cuentan para su récord
+    """
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.valid_teams = {team for (_user, team) in LEAGUE_ORDER}
+        self.team_of = dict(LEAGUE_ORDER)
+        self.records = {user: [0, 0, set(), []] for user in self.team_of}  # W, L, huellas, detalle
+        self.logs = {user: [] for user in self.team_of}
+        self.buckets = {}
+        self.postseason = []   # juegos normalizados sin "raw"
+        self.inputs = []   # lo que se vio de cada juego (conservado o duplicado), para digest()
+
+    def _credit(self, g, kept):
+        kept_id, kept_fp = kept
+        user = g["source"]
+        team = self.team_of.get(user)
+        if team is None or g["dt"] < SINCE:
+            return
+        if norm_team(team) not in (norm_team(g["home_team"]), norm_team(g["away_team"])):
+            return
+        if not is_league_matchup(g["home_name"], g["away_name"]):
+            return
+        rec = self.records[user]
+        if kept_fp in rec[2]:
+            return
+        rec[2].add(kept_fp)
+        w, l, line = _decision_for(g, team)
+        rec[0] += w
+        rec[1] += l
+        if line and PRINT_DETAILS:
+            rec[3].append(line)
+        is_home = norm_team(g["home_team"]) == norm_team(team)
+        own, opp = (g["home_score"], g["away_score"]) if is_home else (g["away_score"], g["home_score"])
+        self.logs[user].append({
+            "id": kept_id,
+            "ts": g["ts"],
+            "ended_at_local": g["ended_at_local"],
+            "home": is_home,
+            "opponent": g["away_team"] if is_home else g["home_team"],
+            "runs_for": own,
+            "runs_against": opp,
+            "result": "W" if w else ("L" if l else "-"),
+        })
+
+    def _remember(self, g, kept):
+        self.inputs.append((kept[0], g["id"], g["source"], g["ts"], g["home_team"], g["away_team"],
+                            g["home_score"], g["away_score"], g["home_result"], g["away_result"],
+                            g["home_name"], g["away_name"], g["pitcher_info"]))
+
+    def add(self, g):
+        kept = (g["id"], g["fingerprint"])
+        self._remember(g, kept)
+        self._credit(g, kept)
+        home, away = g["home_team"], g["away_team"]
+        if home not in self.valid_teams or away not in self.valid_teams:
+            return
+        self.buckets.setdefault(day_key_scl(g["d_local"], self.mode), []).append({
+            "id": g["id"],
+            "home_team": home,
+            "away_team": away,
+            "home_score": g["home_score"],
+            "away_score": g["away_score"],
+            "ended_at_local": g["ended_at_local"],
+            "ts": g["ts"],
+        })
+        if g["dt"] >= SINCE and is_league_matchup(g["home_name"], g["away_name"]):
+            self.postseason.append({k: v for k, v in g.items() if k != "raw"})
+
+    def add_duplicate(self, g, kept):
+        # El mismo juego desde el historial de otro usuario: solo cuenta para su récord.
+        # kept = (id, huella) del juego conservado
+        self._remember(g, kept)
+        self._credit(g, kept)
+
+    def digest(self):
+        """Huella de todo lo capturado en el ciclo (independiente del orden de llegada)."""
+        h = hashlib.blake2b(digest_size=16)
+        for item in sorted(self.inputs, key=repr):
+            h.update(repr(item).encode("utf-8"))
+        return h.hexdigest()
+
+    def rows(self):
+        rows = [_standings_row(user, team, *self.records[user][:2], self.records[user][3])
+                for user, team in LEAGUE_ORDER]
+        rows.sort(key=lambda r: (-r.get("points", 0), -r.get("wins", 0), r.get("losses", 0)))
+        return rows
+
+    def team_logs(self):
+        """{team: [juego, ...]} del más reciente al más antiguo."""
+        return {team: sorted(self.logs[user], key=lambda e: e["ts"], reverse=True)
+                for user, team in LEAGUE_ORDER}
+
+    def horizon(self):
+        """{team: ts del juego más antiguo capturado del historial de su usuario}"""
+        oldest = {}
+        for item in self.inputs:
+            user, ts = item[2], item[3]
+            if user not in oldest or ts < oldest[user]:
+                oldest[user] = ts
+        return {self.team_of[user]: ts for user, ts in oldest.items() if user in self.team_of}
+
+    def games_by_day(self):
+        index = {}
+        for day in sorted(self.buckets):
+            games = sorted(self.buckets[day], key=lambda x: x["ts"])
+            index[day] = {"games": games, "summary": _day_summary(games)}
+        return index
+
+def run_league_cycle(mode=None, prefetch=None):
+    """Una pasada por la API que llena un LeagueCycle."""
+    cycle = LeagueCycle(mode)
+    for g in iter_league_games("cycle", cycle.add_duplicate, prefetch):
+        cycle.add(g)
+    if cycle.inputs:
+        prune_fingerprint_ids(min(item[3] for item in cycle.inputs))
+    return cycle
+
+def build_games_by_day(mode=None):
+    """
+    Índice de juegos de la liga por día local (America/Santiago), calculado
+    una vez por ciclo:
+      { "YYYY-MM-DD": {"games": [juego, ...] (orden cronológico), "summary": {...}} }
+    Cada juego: {id, home_team, away_team, home_score, away_score, ended_at_local, ts}
+    """
+    return run_league_cycle(mode).games_by_day()
 
-        items.append((d_local, f"{home} {hr} - {away} {ar}  - {fecha_hora} (hora Chile)"))
 
-    items.sort(key=lambda x: x[0])
-    return [s for _, s in items]
+def games_played_today_scl(games_by_day=None):
+    """
+    Juegos de HOY (Santiago, según DAY_WINDOW_MODE) como strings:
+    "Yankees 4 - Tigers 2  - 24-09-2025 - 9:10 pm (hora Chile)".
+    Si ya se construyó el índice por día en este ciclo, se reutiliza.
+    """
+    if games_by_day is None:
+        games_by_day = build_games_by_day()
+    today = day_key_scl(datetime.now(ZoneInfo("America/Santiago")))
+    return [
+        f"{g['home_team']} {g['home_score']} - {g['away_team']} {g['away_score']}  - {g['ended_at_local']}"
+        for g in (games_by_day.get(today) or {}).get("games", [])
+    ]
 
 
 # === FIN DE TU LÓGICA ACTUAL ===
@@ -415,52 +851,22 @@ def games_played_today_scl():
 
 def _collect_postseason_raw():
     """Juegos de la liga (entre equipos válidos) desde SINCE."""
-    tz_scl = ZoneInfo("America/Santiago")
-    tz_utc = ZoneInfo("UTC")
     valid_teams = {team for (_user, team) in LEAGUE_ORDER}
-    # capturar
-    all_pages = []
-    for username_exact, _team in LEAGUE_ORDER:
-        for p in PAGES:
-            all_pages += fetch_page(username_exact, p)
-    # dedup y filtro
-    seen_ids = set()
-    seen_pairs = set()
     raw = []
-    for g in dedup_by_id(all_pages):
-        if (g.get("game_mode") or "").strip().upper() != MODE:
-            continue
-        d = parse_date(g.get("display_date", ""))
-        if not d or d < SINCE:
+    for g in iter_league_games("postseason_raw"):
+        if g["dt"] < SINCE:
             continue
-        if d.tzinfo is None:
-            d = d.replace(tzinfo=tz_utc)
-        d_local = d.astimezone(tz_scl)
-        home = (g.get("home_full_name") or "").strip()
-        away = (g.get("away_full_name") or "").strip()
+        home, away = g["home_team"], g["away_team"]
         if home not in valid_teams or away not in valid_teams:
             continue
-        gid = str(g.get("id") or "")
-        hr = int(g.get("home_runs") or 0)
-        ar = int(g.get("away_runs") or 0)
-        # evitar duplicados estrictos por id
-        if gid and gid in seen_ids:
-            continue
-        if gid:
-            seen_ids.add(gid)
-        # formateo
-        try:
-            ended = d_local.strftime("%d-%m-%Y - %-I:%M %p").lower()
-        except Exception:
-            ended = d_local.strftime("%d-%m-%Y - %#I:%M %p").lower()
         raw.append({
-            "id": gid,
+            "id": g["id"],
             "home_team": home,
             "away_team": away,
-            "home_score": hr,
-            "away_score": ar,
-            "ended_at_local": f"{ended} (hora Chile)",
-            "ended_dt": d_local,
+            "home_score": g["home_score"],
+            "away_score": g["away_score"],
+            "ended_at_local": g["ended_at_local"],
+            "ended_dt": g["d_local"],
         })
     raw.sort(key=lambda r: r["ended_dt"])
     return raw
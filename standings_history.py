@@ -0,0 +1,170 @@
+# standings_history.py
+"""
+Historial de la tabla: W/L acumulados por equipo y por día (sumas de
+prefijo sobre la bitácora de cada equipo agrupada por día local, partiendo
+de los ajustes TEAM_RECORD_ADJUSTMENTS como línea base). La bitácora es la
+misma que acredita la tabla en vivo (LeagueCycle), así que as_of=<hoy>
+coincide con /api/standings. "¿Cómo estaba la tabla el día X?" se responde
+en O(equipos) sin volver a recorrer juegos.
+
+La API solo entrega las últimas páginas de cada usuario, así que cada ciclo
+recalcula solo los días que cubren los juegos capturados; los anteriores al
+juego más antiguo capturado de cada equipo se copian del historial guardado
+(congelados), con los ajustes que regían entonces.
+
+Archivo (standings_history.json):
+    {
+      "start": "2025-09-24",          # primer día de la temporada (SINCE)
+      "days":  ["2025-09-24", ...],   # días consecutivos hasta hoy
+      "teams": [...], "users": [...],
+      "base_w": [...], "base_l": [...], "extra": [...],   # ajustes manuales vigentes
+      "w": [[...], ...], "l": [[...], ...],               # por equipo: acumulado por día (sobre base_w/base_l)
+      "extra_days": [[...], ...]                          # por equipo: ajuste de puntos de cada día
+    }
+
+Los historiales archivados antes de "extra_days" usan "extra" para todos
+los días.
+
+Cuando cambia la temporada (otro "start"), el historial anterior se
+archiva comprimido en ARCHIVE_DIR/standings_<start>.json.gz.
+"""
+import gzip, json, os
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(BASE_DIR, "standings_history.json")
+ARCHIVE_DIR = os.path.join(BASE_DIR, "history")
+
+
+def build_history(team_logs, league_order, start_day, end_day, day_of, record_adj=None, point_adj=None,
+                  previous=None, horizon=None):
+    """
+    team_logs: {team: [{"ts", "result": "W"|"L"|"-"}, ...]} (LeagueCycle.team_logs()).
+    day_of(ts) -> "YYYY-MM-DD" (día local, mismo criterio que /api/games).
+    Un juego acreditado fuera de [start_day, end_day] (SINCE está en UTC) se
+    cuenta en el día más cercano del rango.
+    previous: historial guardado (load()); horizon: {team: ts del juego más
+    antiguo capturado para ese equipo}. Los días de previous anteriores al
+    horizonte (o a end_day si el equipo no tiene capturas) quedan tal cual.
+    """
+    record_adj = record_adj or {}
+    point_adj = point_adj or {}
+    d0, d1 = date.fromisoformat(start_day), date.fromisoformat(end_day)
+    days = [(d0 + timedelta(days=i)).isoformat() for i in range(max((d1 - d0).days + 1, 1))]
+    day_idx = {d: i for i, d in enumerate(days)}
+    teams = [t for (_u, t) in league_order]
+
+    # Juegos ganados/perdidos por día, luego suma de prefijo
+    w = [[0] * len(days) for _ in teams]
+    l = [[0] * len(days) for _ in teams]
+    for i, team in enumerate(teams):
+        for e in team_logs.get(team) or []:
+            if e["result"] not in ("W", "L"):
+                continue
+            day = min(max(day_of(e["ts"]), days[0]), days[-1])
+            (w if e["result"] == "W" else l)[i][day_idx[day]] += 1
+    for i in range(len(teams)):
+        for di in range(1, len(days)):
+            w[i][di] += w[i][di - 1]
+            l[i][di] += l[i][di - 1]
+
+    history = {
+        "start": start_day,
+        "days": days,
+        "teams": teams,
+        "users": [u for (u, _t) in league_order],
+        "base_w": [record_adj.get(t, (0, 0))[0] for t in teams],
+        "base_l": [record_adj.get(t, (0, 0))[1] for t in teams],
+        "extra": [point_adj.get(t, (0, ""))[0] for t in teams],
+        "w": w,
+        "l": l,
+    }
+    history["extra_days"] = [[x] * len(days) for x in history["extra"]]
+    if previous and previous.get("start") == start_day:
+        _freeze(history, previous, horizon or {}, day_of)
+    return history
+
+
+def _freeze(history, previous, horizon, day_of):
+    """Copia de `previous` los días que ya no cubren los juegos capturados."""
+    days = history["days"]
+    prev_idx = {t: j for j, t in enumerate(previous.get("teams") or [])}
+    prev_days = len(previous.get("days") or [])
+    for i, team in enumerate(history["teams"]):
+        j = prev_idx.get(team)
+        if j is None:
+            continue
+        first = day_of(horizon[team]) if team in horizon else days[-1]
+        cut = min(max((date.fromisoformat(first) - date.fromisoformat(days[0])).days, 0), prev_days, len(days))
+        # w/l se guardan sobre la base vigente: se re-expresan para que el total del día no cambie
+        dw = previous["base_w"][j] - history["base_w"][i]
+        dl = previous["base_l"][j] - history["base_l"][i]
+        prev_extra = previous["extra_days"][j] if "extra_days" in previous else [previous["extra"][j]] * prev_days
+        for di in range(cut):
+            history["w"][i][di] = previous["w"][j][di] + dw
+            history["l"][i][di] = previous["l"][j][di] + dl
+            history["extra_days"][i][di] = prev_extra[di]
+
+
+def load(path=HISTORY_FILE):
+    """Historial guardado, o None si no hay uno legible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(history, path=HISTORY_FILE, archive_dir=ARCHIVE_DIR):
+    """Escribe el historial; si el existente es de otra temporada, lo archiva comprimido."""
+    old = load(path)
+    if old and old.get("start") != history["start"]:
+        os.makedirs(archive_dir, exist_ok=True)
+        with gzip.open(os.path.join(archive_dir, f"standings_{old['start']}.json.gz"), "wt", encoding="utf-8") as f:
+            json.dump(old, f, separators=(",", ":"))
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_archive(start, archive_dir=ARCHIVE_DIR):
+    with gzip.open(os.path.join(archive_dir, f"standings_{start}.json.gz"), "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def archived_starts(archive_dir=ARCHIVE_DIR):
+    try:
+        names = os.listdir(archive_dir)
+    except OSError:
+        return []
+    return sorted(n[len("standings_"):-len(".json.gz")] for n in names
+                  if n.startswith("standings_") and n.endswith(".json.gz"))
+
+
+def standings_as_of(history, as_of):
+    """
+    Tabla al cierre del día `as_of` (YYYY-MM-DD). Antes del primer día se
+    usa solo la línea base; después del último, el último día disponible.
+    """
+    days = history["days"]
+    if as_of < days[0]:
+        di = None
+    else:
+        di = (date.fromisoformat(min(as_of, days[-1])) - date.fromisoformat(days[0])).days
+    extra_days = history.get("extra_days")
+    rows = []
+    for i, team in enumerate(history["teams"]):
+        wins = history["base_w"][i] + (history["w"][i][di] if di is not None else 0)
+        losses = history["base_l"][i] + (history["l"][i][di] if di is not None else 0)
+        extra = extra_days[i][di] if (extra_days and di is not None) else history["extra"][i]
+        rows.append({
+            "user": history["users"][i],
+            "team": team,
+            "wins": wins,
+            "losses": losses,
+            "played": wins + losses,
+            "points": 2 * wins + losses + extra,
+        })
+    rows.sort(key=lambda r: (-r["points"], -r["wins"], r["losses"]))
+    return rows
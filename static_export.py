@@ -0,0 +1,112 @@
+# static_export.py
+"""
+Exportación estática del sitio: en cada ciclo del updater se renderiza
+templates/index.html con la tabla y los brackets ya pintados (server-side)
+y se escriben las secciones en JSON, de modo que nginx o cualquier hosting
+estático pueda servirlo sin tocar Python por request.
+
+Estructura de salida:
+    <out>/index.html
+    <out>/static/styles.css
+    <out>/data/full.json
+    <out>/data/full_compact.json (postseason_games columnar, ver snapshot_compact)
+    <out>/data/<seccion>.json   (standings, games_today, postseason_games, ...)
+    <out>/data/export.json      (versión del snapshot y huella de plantilla/CSS)
+
+export.json se escribe al final; is_current() lo usa para saber si hay que
+volver a exportar aunque el snapshot no haya cambiado.
+"""
+import hashlib, json, os, re, shutil
+
+import snapshot_compact
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+
+SECTIONS = ("standings", "games_today", "postseason_games", "wildcard_bracket", "bracket8")
+
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=select_autoescape(["html"]),
+)
+
+
+def parse_game_string(s):
+    """
+    Versión Python de parseGameString() del frontend:
+    "Yankees 4 - Tigers 2  - 24-09-2025 - 9:10 pm (hora Chile)" -> dict
+    """
+    if not isinstance(s, str):
+        return s
+    parts = re.sub(r"\s+", " ", s).strip().split(" - ")
+    if len(parts) < 4:
+        return {"raw": s}
+    home_part, away_part, date_part, time_part = parts[:4]
+    home, _, hs = home_part.rpartition(" ")
+    away, _, as_ = away_part.rpartition(" ")
+    return {
+        "home_team": home or hs,
+        "home_score": hs if home else "",
+        "away_team": away or as_,
+        "away_score": as_ if away else "",
+        "ended_at_local": f"{date_part} - {time_part}",
+    }
+
+
+def _write_atomic(path, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _json_bytes(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _assets_digest():
+    h = hashlib.blake2b(digest_size=16)
+    for path in (os.path.join(TEMPLATES_DIR, "index.html"), os.path.join(STATIC_DIR, "styles.css")):
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"-")
+    return h.hexdigest()
+
+
+def is_current(payload, out_dir):
+    """True si `out_dir` ya tiene exportado este snapshot con la plantilla actual."""
+    try:
+        with open(os.path.join(out_dir, "data", "export.json"), "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return (stamp.get("version") or 0) >= payload.get("version", 0) and stamp.get("assets") == _assets_digest()
+
+
+def export_site(payload, out_dir):
+    """Escribe el sitio completo para el snapshot `payload` en `out_dir`."""
+    data_dir = os.path.join(out_dir, "data")
+
+    for key in SECTIONS:
+        _write_atomic(os.path.join(data_dir, f"{key}.json"), _json_bytes(payload.get(key)))
+    _write_atomic(os.path.join(data_dir, "full.json"), _json_bytes(payload))
+    _write_atomic(os.path.join(data_dir, "full_compact.json"), _json_bytes(snapshot_compact.compact_payload(payload)))
+
+    css_src = os.path.join(STATIC_DIR, "styles.css")
+    if os.path.exists(css_src):
+        os.makedirs(os.path.join(out_dir, "static"), exist_ok=True)
+        shutil.copyfile(css_src, os.path.join(out_dir, "static", "styles.css"))
+
+    snapshot = dict(payload)
+    snapshot["games_today_parsed"] = [parse_game_string(g) for g in payload.get("games_today") or []]
+    html = _env.get_template("index.html").render(snapshot=snapshot, full_url="data/full_compact.json", changes_url=None,
+                                                 postseason_url=None, teams_url=None)
+    _write_atomic(os.path.join(out_dir, "index.html"), html.encode("utf-8"))
+    _write_atomic(os.path.join(data_dir, "export.json"),
+                  _json_bytes({"version": payload.get("version"), "assets": _assets_digest()}))
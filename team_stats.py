@@ -0,0 +1,88 @@
+# team_stats.py
+"""
+Estadísticas por equipo a partir de la bitácora de juegos acreditados
+(LeagueCycle.team_logs()), así que cuadran con la tabla de posiciones:
+carreras anotadas/permitidas, diferencial, racha actual, últimos 10 y
+récord de local/visita.
+
+Los acumuladores son arreglos paralelos indexados por equipo (según
+LEAGUE_ORDER) y se alimentan incrementalmente (ver incremental.py). La racha
+y los últimos 10 se arman en snapshot() desde los resultados vigentes,
+ordenados por ts.
+"""
+from incremental import IncrementalAggregator
+
+LAST_N = 10
+
+
+def log_entries(team_logs):
+    """{team: [entrada, ...]} -> [{"team": team, **entrada}, ...]"""
+    return [{"team": team, **e} for team, entries in team_logs.items() for e in entries]
+
+
+class TeamStatsAggregator(IncrementalAggregator):
+    def __init__(self, teams):
+        self.teams = list(teams)
+        self.idx = {t: i for i, t in enumerate(self.teams)}
+        self.reset()
+
+    def _key(self, e):
+        return (e["team"], e.get("id") or f'{e["opponent"]}|{e["ts"]}')
+
+    def _clear(self):
+        n = len(self.teams)
+        self.runs_for = [0] * n
+        self.runs_against = [0] * n
+        self.home_w = [0] * n
+        self.home_l = [0] * n
+        self.away_w = [0] * n
+        self.away_l = [0] * n
+        self.games = [0] * n
+        self.results = [{} for _ in range(n)]  # clave -> (ts, "W"/"L")
+
+    def _fold(self, e, sign):
+        i = self.idx.get(e["team"])
+        if i is None:
+            return
+        self.runs_for[i] += sign * e["runs_for"]
+        self.runs_against[i] += sign * e["runs_against"]
+        self.games[i] += sign
+        res = e["result"]
+        if res not in ("W", "L"):
+            return
+        if e["home"]:
+            if res == "W":
+                self.home_w[i] += sign
+            else:
+                self.home_l[i] += sign
+        elif res == "W":
+            self.away_w[i] += sign
+        else:
+            self.away_l[i] += sign
+        key = self._key(e)
+        if sign > 0:
+            self.results[i][key] = (e["ts"], res)
+        else:
+            self.results[i].pop(key, None)
+
+    def snapshot(self):
+        out = {}
+        for i, team in enumerate(self.teams):
+            ordered = [res for _ts, res in sorted(self.results[i].values())]  # más reciente al final
+            recent = ordered[-LAST_N:]
+            count = 0
+            for res in reversed(ordered):
+                if res != ordered[-1]:
+                    break
+                count += 1
+            out[team] = {
+                "games": self.games[i],
+                "runs_scored": self.runs_for[i],
+                "runs_allowed": self.runs_against[i],
+                "run_diff": self.runs_for[i] - self.runs_against[i],
+                "streak": f"{ordered[-1]}{count}" if ordered else "",
+                "last10": f"{recent.count('W')}-{recent.count('L')}",
+                "home": f"{self.home_w[i]}-{self.home_l[i]}",
+                "away": f"{self.away_w[i]}-{self.away_l[i]}",
+            }
+        return out
@@ -1,5 +1,5 @@
 # update_cache.py
-import json, os, sys, time
+import json, os, signal, sys, threading, time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
@@ -8,359 +8,396 @@ try:
 except Exception:
     import standings_cascade_points as standings
 
+import bracket_engine
+import derived_views
+import game_index
+import refresh_trigger
+import snapshot_compact
+import snapshot_delta
+import snapshot_shm
+import standings_history
+import static_export
+import pitching_stats
+import team_stats
+import updater_lock
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CACHE_FILE = os.path.join(BASE_DIR, "standings_cache.json")
+CACHE_COMPACT_FILE = os.path.join(BASE_DIR, "standings_cache_compact.json")
+GAMES_BY_DATE_FILE = os.path.join(BASE_DIR, "games_by_date.json")
+TEAM_LOGS_FILE = os.path.join(BASE_DIR, "team_logs.json")   # bitácora por equipo (se pide al expandir la fila)
+POSTSEASON_INDEX_FILE = os.path.join(BASE_DIR, "postseason_index.json")   # paginación por cursor
+DEDUP_AUDIT_FILE = os.path.join(BASE_DIR, "dedup_audit.json")   # duplicados con otro id e ids canónicos
 SCL = ZoneInfo("America/Santiago")
 
-# ========================= EXCLUSIONES (se mantienen) =========================
-EXCLUDE_STRINGS = {
-    "Yankees 0 - 0 Mets - 08-09-2025 - 9:40 pm (hora Chile)",
-}
-EXCLUDE_RULES = [
-    {
-        "home_team": "Yankees",
-        "away_team": "Mets",
-        "home_score": 0,
-        "away_score": 0,
-        "ended_at_local_contains": "08-09-2025 - 9:40"
-    }
-]
-
-def _should_exclude_game(g):
-    if isinstance(g, str):
-        return g.strip() in EXCLUDE_STRINGS
-    if isinstance(g, dict):
-        for rule in EXCLUDE_RULES:
-            ok = True
-            for k, v in rule.items():
-                if k == "ended_at_local_contains":
-                    if v not in (g.get("ended_at_local") or ""):
-                        ok = False
-                        break
-                else:
-                    if g.get(k) != v:
-                        ok = False
-                        break
-            if ok:
-                return True
-    return False
+# Sitio estático pre-renderizado (vacío = desactivado); también vía --static-out DIR
+STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", "")
+
+# Un solo updater a la vez: "wait" (quedar como lector hasta ser líder) o "exit"
+LOCK_MODE = os.getenv("UPDATER_LOCK_MODE", "wait")
+LOCK_RETRY_SECONDS = int(os.getenv("UPDATER_LOCK_RETRY_SECONDS", "30"))
+LEASE_SECONDS = int(os.getenv("UPDATER_LEASE_SECONDS", "0"))  # 0 = 3x UPDATE_INTERVAL_SECONDS
+
+# Las exclusiones y correcciones manuales viven en standings.GAME_EXCLUSIONS /
+# standings.GAME_OVERRIDES y se aplican en standings.normalize_game(), de modo
+# que standings, juegos de hoy, postemporada y brackets ven el mismo conjunto.
 
 # ========================= CAPTURA POSTEMPORADA =========================
-def _collect_postseason_games():
+def _collect_postseason_games(cycle=None):
     """
     Devuelve TODOS los juegos desde standings.SINCE (postemporada),
     filtrando por equipos válidos de la liga y por duelo (miembro vs miembro,
     o CPU vs miembro) de acuerdo a la misma lógica de tu módulo standings.
+    `cycle`: standings.LeagueCycle ya recorrido en este ciclo (si no, se hace una pasada).
     Salida: lista de dicts (no necesariamente ordenada cronológicamente):
-      {home_team, away_team, home_score, away_score, ended_at_local}
+      {id, home_team, away_team, home_score, away_score, ended_at_local, ts, pitchers}
     """
-    tz_scl = SCL
-    tz_utc = ZoneInfo("UTC")
-    valid_teams = {team for (_user, team) in standings.LEAGUE_ORDER}
-
-    # Acumular páginas de usuarios + aliases
-    all_pages = []
-    for username_exact, _team in standings.LEAGUE_ORDER:
-        usernames_to_fetch = [username_exact] + standings.FETCH_ALIASES.get(username_exact, [])
-        for uname in usernames_to_fetch:
-            for p in standings.PAGES:
-                all_pages += standings.fetch_page(uname, p)
+    if cycle is None:
+        cycle = standings.run_league_cycle()
 
     out = []
-    seen_ids = set()
-    for g in standings.dedup_by_id(all_pages):
-        try:
-            if (g.get("game_mode") or "").strip().upper() != standings.MODE:
-                continue
-
-            d = standings.parse_date(g.get("display_date", ""))
-            if not d or d < standings.SINCE:
-                continue
-            if d.tzinfo is None:
-                d = d.replace(tzinfo=tz_utc)
-            d_local = d.astimezone(tz_scl)
-
-            home = (g.get("home_full_name") or "").strip()
-            away = (g.get("away_full_name") or "").strip()
-            if home not in valid_teams or away not in valid_teams:
-                continue
-
-            # Miembros vs miembros (o CPU + miembro)
-            home_name_raw = g.get("home_name", "")
-            away_name_raw = g.get("away_name", "")
-            h_norm = standings.normalize_user_for_compare(home_name_raw)
-            a_norm = standings.normalize_user_for_compare(away_name_raw)
-            h_mem = h_norm in standings.LEAGUE_USERS_NORM
-            a_mem = a_norm in standings.LEAGUE_USERS_NORM
-            if not ((h_mem and a_mem) or (standings.is_cpu(home_name_raw) and a_mem) or (standings.is_cpu(away_name_raw) and h_mem)):
-                continue
-
-            gid = str(g.get("id") or "")
-            if gid and gid in seen_ids:
-                continue
-            if gid:
-                seen_ids.add(gid)
-
-            hr = int(g.get("home_runs") or 0)
-            ar = int(g.get("away_runs") or 0)
-
-            try:
-                ended = d_local.strftime("%d-%m-%Y - %-I:%M %p").lower()
-            except Exception:
-                ended = d_local.strftime("%d-%m-%Y - %#I:%M %p").lower()
-
-            out.append({
-                "home_team": home,
-                "away_team": away,
-                "home_score": hr,
-                "away_score": ar,
-                "ended_at_local": f"{ended} (hora Chile)"
-            })
-        except Exception:
-            continue
-
+    for g in cycle.postseason:
+        gid, home, away = g["id"], g["home_team"], g["away_team"]
+        hr, ar = g["home_score"], g["away_score"]
+        out.append({
+            # id estable para /api/changes (algunos juegos vienen sin id)
+            "id": gid or f"{home}|{away}|{hr}|{ar}|{g['d_local']:%Y%m%d%H%M}",
+            "home_team": home,
+            "away_team": away,
+            "home_score": hr,
+            "away_score": ar,
+            "ended_at_local": g["ended_at_local"],
+            "ts": g["ts"],
+            "pitchers": g["pitchers"],   # {"win", "loss", "save"} desde display_pitcher_info
+        })
     return out
 
-# ========================= UTILIDADES SERIES =========================
-def _pair_key(a, b):
-    return tuple(sorted([a, b]))
+# ========================= BRACKET (grafo configurable) =========================
+# Formato MLB: Wild Card Bo1 entre seeds 7..10 (WC3 = perdedor WC1 vs ganador WC2),
+# Cuartos y Semis Bo5, Final Bo7. Un formato nuevo solo requiere cambiar esta tabla.
+BRACKET_CONFIG = {
+    "rounds": [
+        ("wildcard", [
+            {"id": "WC1", "best_of": 1, "a": {"seed": 7}, "b": {"seed": 8}},
+            {"id": "WC2", "best_of": 1, "a": {"seed": 9}, "b": {"seed": 10}},
+            {"id": "WC3", "best_of": 1, "a": {"loser_of": "WC1"}, "b": {"winner_of": "WC2"}},
+        ]),
+        ("quarters", [
+            {"id": "QF1", "best_of": 5, "a": {"seed": 1}, "b": {"winner_of": "WC3"}},
+            {"id": "QF2", "best_of": 5, "a": {"seed": 2}, "b": {"winner_of": "WC1"}},
+            {"id": "QF3", "best_of": 5, "a": {"seed": 3}, "b": {"seed": 6}},
+            {"id": "QF4", "best_of": 5, "a": {"seed": 4}, "b": {"seed": 5}},
+        ]),
+        ("semis", [
+            {"id": "SF1", "best_of": 5, "a": {"winner_of": "QF1"}, "b": {"winner_of": "QF2"}},
+            {"id": "SF2", "best_of": 5, "a": {"winner_of": "QF3"}, "b": {"winner_of": "QF4"}},
+        ]),
+        ("final", [
+            {"id": "F1", "best_of": 7, "a": {"winner_of": "SF1"}, "b": {"winner_of": "SF2"}},
+        ]),
+    ],
+    "champion_of": "F1",
+}
 
-def _series_summary(a, b, games, best_of):
-    """
-    Cuenta victorias en la pareja (a vs b).
-    best_of = 1/5/7 => wins_needed = 1/3/4
-    Retorna: dict(status, series_score 'x-y', wins_a, wins_b, total, winner, wins_needed)
-    """
-    wins_needed = {1: 1, 5: 3, 7: 4}[best_of]
-    wins_a = wins_b = 0
-    for g in games:
-        if _pair_key(g["home_team"], g["away_team"]) != _pair_key(a, b):
-            continue
-        if g["home_score"] > g["away_score"]:
-            w = g["home_team"]
-        elif g["away_score"] > g["home_score"]:
-            w = g["away_team"]
-        else:
-            continue
-        if w == a:
-            wins_a += 1
-        elif w == b:
-            wins_b += 1
-    total = wins_a + wins_b
-    if total == 0:
-        status = "PENDIENTE"; winner = None
-    elif wins_a >= wins_needed:
-        status = "JUGADO"; winner = a
-    elif wins_b >= wins_needed:
-        status = "JUGADO"; winner = b
-    else:
-        status = "EN CURSO"; winner = None
-    return {
-        "status": status,
-        "series_score": f"{wins_a}-{wins_b}",
-        "wins_a": wins_a,
-        "wins_b": wins_b,
-        "total": total,
-        "winner": winner,
-        "wins_needed": wins_needed
-    }
-
-# ========================= WILD CARD (detección flexible) =========================
-def _build_wildcard_bracket(standings_rows, postseason_games):
+# Una instancia por proceso: entre ciclos solo re-resuelve las series cuyas entradas cambiaron
+bracket = bracket_engine.BracketEngine(BRACKET_CONFIG)
+
+# Estadísticas por equipo (incrementales entre ciclos)
+team_stats_agg = team_stats.TeamStatsAggregator([team for (_user, team) in standings.LEAGUE_ORDER])
+pitching_agg = pitching_stats.PitchingAggregator(standings.LEAGUE_ORDER)
+
+def _build_brackets(standings_rows, postseason_games):
     """
-    Detección flexible:
-      - Tomamos equipos 7..10 de standings.
-      - Primer cruce único observado entre esos 4 => WC1 (Bo1)
-      - Segundo cruce único observado => WC2 (Bo1)
-      - WC3 = perdedor(WC1) vs ganador(WC2) (Bo1)
-    Si no hay cruces aún, mostramos placeholders con seeds (7vs8) y (9vs10).
+    Retorna (wildcard_bracket, bracket8) con la forma que espera el frontend:
+      wildcard_bracket = [WC1, WC2, WC3]
+      bracket8 = {quarters, semis, final, champion} (None si la tabla tiene < 6 equipos)
     """
-    def _row_key(r):
-        return (-r.get("points", 0), -r.get("wins", 0), r.get("losses", 0))
-    rows = sorted(standings_rows, key=_row_key)
-
-    if len(rows) < 10:
-        return [
-            {"id": "WC1", "home": "-", "away": "-", "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1},
-            {"id": "WC2", "home": "-", "away": "-", "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1},
-            {"id": "WC3", "home": "Perdedor WC1", "away": "Ganador WC2", "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1},
-        ]
-
-    s7, s8, s9, s10 = rows[6]["team"], rows[7]["team"], rows[8]["team"], rows[9]["team"]
-    four = {s7, s8, s9, s10}
-
-    # Placeholders "clásicos"
-    wc1 = {"id": "WC1", "home": s7, "away": s8,  "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1}
-    wc2 = {"id": "WC2", "home": s9, "away": s10, "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1}
-    wc3 = {"id": "WC3", "home": "Perdedor WC1", "away": "Ganador WC2", "status": "PENDIENTE", "score": "", "winner": None, "loser": None, "best_of": 1}
-
-    def _pair(g): return tuple(sorted([g["home_team"], g["away_team"]]))
-    # pares únicos entre 7..10 en el ORDEN de aparición; además guardamos el ÚLTIMO resultado de cada par
-    pairs, last_by_pair = [], {}
-    for g in postseason_games:
-        if g["home_team"] in four and g["away_team"] in four:
-            pk = _pair(g)
-            last_by_pair[pk] = g
-            if pk not in pairs:
-                pairs.append(pk)
-
-    def _fill_wc_slot(slot, last):
-        slot["home"], slot["away"] = last["home_team"], last["away_team"]
-        slot["score"] = f'{last["home_score"]}-{last["away_score"]}'
-        slot["status"] = "JUGADO"
-        if last["home_score"] > last["away_score"]:
-            slot["winner"], slot["loser"] = last["home_team"], last["away_team"]
-        else:
-            slot["winner"], slot["loser"] = last["away_team"], last["home_team"]
-
-    if len(pairs) >= 1:
-        _fill_wc_slot(wc1, last_by_pair[pairs[0]])
-    if len(pairs) >= 2:
-        _fill_wc_slot(wc2, last_by_pair[pairs[1]])
-
-    # WC3 = perdedor(WC1) vs ganador(WC2)
-    if wc1["loser"] and wc2["winner"]:
-        a, b = wc1["loser"], wc2["winner"]
-        last = None
-        for g in postseason_games:
-            if {g["home_team"], g["away_team"]} == {a, b}:
-                last = g
-        if last:
-            _fill_wc_slot(wc3, last)
-        else:
-            wc3["home"], wc3["away"] = a, b
-
-    return [wc1, wc2, wc3]
-
-# ========================= BRACKET 8 (Bo5 / Bo5 / Bo7) =========================
-def _build_bracket8(standings_rows, wildcard_bracket, postseason_games):
+    games = sorted(postseason_games, key=lambda g: g.get("ts") or 0)
+    rounds = bracket.evaluate(standings_rows, games)
+    if bracket.last_evaluated:
+        print(f"Bracket: series re-evaluadas {', '.join(bracket.last_evaluated)}")
+    bracket8 = None
+    if len(standings_rows) >= 6:
+        bracket8 = {
+            "quarters": rounds["quarters"],
+            "semis":    rounds["semis"],
+            "final":    rounds["final"][0],
+            "champion": rounds["champion"],
+        }
+    return rounds["wildcard"], bracket8
+
+# ========================= VISTAS DERIVADAS =========================
+# Cada vista es un nodo con entradas hasheadas (ver derived_views): solo se
+# recalcula si cambiaron los juegos capturados, la configuración o el día en
+# Santiago. Los artefactos en disco también son nodos, así que solo se
+# reescriben cuando cambia lo que contienen.
+SNAPSHOT_KEYS = ("standings", "games_today", "postseason_games", "wildcard_bracket", "bracket8", "team_stats", "pitching")
+
+def _config_digest():
+    return derived_views.digest({
+        "league_order": standings.LEAGUE_ORDER,
+        "since": standings.SINCE,
+        "record_adj": standings.TEAM_RECORD_ADJUSTMENTS,
+        "point_adj": standings.TEAM_POINT_ADJUSTMENTS,
+        "day_mode": standings.DAY_WINDOW_MODE,
+        "day_cutoff": standings.SPORTS_DAY_CUTOFF_HOUR,
+        "bracket": BRACKET_CONFIG,
+    })
+
+def _team_stats_view(team_logs):
+    team_stats_agg.update(team_stats.log_entries(team_logs))
+    return team_stats_agg.snapshot()
+
+def _pitching_view(cycle):
+    # Juegos normalizados (con home_user/away_user): solo se acreditan los lados de miembros
+    pitching_agg.update(cycle.postseason)
+    return pitching_agg.snapshot()
+
+def _write_history(team_logs, horizon, _config, today):
+    # Los días que ya no cubren los juegos capturados se conservan del historial guardado
+    standings_history.save(standings_history.build_history(
+        team_logs, standings.LEAGUE_ORDER,
+        start_day=standings.SINCE.strftime("%Y-%m-%d"),
+        end_day=today,
+        day_of=lambda ts: standings.day_key_scl(datetime.fromtimestamp(ts, SCL)),
+        record_adj=standings.TEAM_RECORD_ADJUSTMENTS,
+        point_adj=standings.TEAM_POINT_ADJUSTMENTS,
+        previous=standings_history.load(),
+        horizon=horizon,
+    ))
+
+def _write_dedup_audit(collisions, canonical_ids):
+    _write_json_atomic(DEDUP_AUDIT_FILE, {"window_seconds": standings.DEDUP_WINDOW_SECONDS,
+                                          "collisions": collisions, "canonical_ids": canonical_ids})
+    if collisions:
+        print(f"Dedup: {len(collisions)} juego(s) repetidos con otro id (ver {os.path.basename(DEDUP_AUDIT_FILE)})")
+
+views = derived_views.ViewGraph(sources=("games", "config", "today", "collisions", "canonical_ids"))
+# Standings, índice por día (SCL, según DAY_WINDOW_MODE) y juegos de HOY
+views.node("standings", ("games", "config"), lambda cycle, _cfg: cycle.rows())
+views.node("games_by_day", ("games", "config"), lambda cycle, _cfg: cycle.games_by_day())
+views.node("games_today", ("games_by_day", "today"), lambda by_day, _today: standings.games_played_today_scl(by_day))
+# Postemporada completa desde SINCE
+views.node("postseason_games", ("games", "config"), lambda cycle, _cfg: _collect_postseason_games(cycle))
+# Wild Card (Bo1) y Bracket 8: QF/SF (Bo5) y Final (Bo7), según BRACKET_CONFIG
+views.node("brackets", ("standings", "postseason_games", "config"), lambda rows, games, _cfg: _build_brackets(rows, games))
+# Bitácora por equipo (juegos acreditados en la tabla)
+views.node("team_logs", ("games", "config"), lambda cycle, _cfg: cycle.team_logs())
+# Carreras, diferencial, racha, últimos 10 y local/visita; líderes de pitcheo
+views.node("team_stats", ("team_logs",), _team_stats_view)
+views.node("pitching", ("games", "config"), lambda cycle, _cfg: _pitching_view(cycle))
+# Artefactos aparte del snapshot
+views.node("horizon", ("games",), lambda cycle: cycle.horizon())
+views.node("history_file", ("team_logs", "horizon", "config", "today"), _write_history)
+views.node("games_by_date_file", ("games_by_day", "config"),
+           lambda by_day, _cfg: _write_json_atomic(GAMES_BY_DATE_FILE, {"mode": standings.DAY_WINDOW_MODE, "days": by_day}))
+views.node("team_logs_file", ("team_logs",), lambda logs: _write_json_atomic(TEAM_LOGS_FILE, {"teams": logs}))
+views.node("postseason_index_file", ("postseason_games",),
+           lambda games: _write_json_atomic(POSTSEASON_INDEX_FILE, game_index.build_index(
+               games, [team for (_user, team) in standings.LEAGUE_ORDER])))
+views.node("dedup_audit_file", ("collisions", "canonical_ids"), _write_dedup_audit)
+
+# ========================= LOOP DE ACTUALIZACIÓN =========================
+def _write_json_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+# Ids canónicos del ciclo anterior (si el proceso se reinició): se leen una vez
+_dedup_state = {"loaded": False}
+
+def _load_dedup_audit():
+    _dedup_state["loaded"] = True
+    try:
+        with open(DEDUP_AUDIT_FILE, "r", encoding="utf-8") as f:
+            standings.load_fingerprint_ids(json.load(f).get("canonical_ids"))
+    except (OSError, ValueError, AttributeError):
+        pass
+
+def _load_previous_payload():
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# Huella del contenido publicado (sin version/last_updated); None = leerla del archivo
+_published = {"digest": None}
+
+def _content_digest(payload):
+    return derived_views.digest({k: payload.get(k) for k in SNAPSHOT_KEYS})
+
+def _compact_version():
+    try:
+        with open(CACHE_COMPACT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _publish_artifacts(payload):
     """
-    Bracket 8 siguiendo MLB:
-      - Seed 7 = ganador real del cruce (7 vs 8) [Bo1]
-      - Seed 8 = ganador real de (perdedor 7–8 vs ganador 9–10) [Bo1]
-      - Cuartos y Semis: Bo5 (gana 3)
-      - Final: Bo7 (gana 4)
-    No depende del orden en que se hayan jugado los WC.
+    Compacto, memoria compartida y sitio estático del snapshot vigente. Cada
+    uno se escribe solo si falta o quedó atrás de payload["version"] (p. ej.
+    tras un reinicio con SNAPSHOT_SHM o STATIC_EXPORT_DIR recién activados,
+    o si cambió la plantilla), aunque el snapshot no haya cambiado.
     """
-    def _row_key(r):
-        return (-r.get("points", 0), -r.get("wins", 0), r.get("losses", 0))
-    rows = sorted(standings_rows, key=_row_key)
-    if len(rows) < 6:
-        return None
+    version = payload["version"]
 
-    s1, s2, s3, s4, s5, s6 = [rows[i]["team"] for i in range(6)]
-    s7, s8, s9, s10 = rows[6]["team"], rows[7]["team"], rows[8]["team"], rows[9]["team"]
-
-    def _series_card(id_, a, b, best_of):
-        placeholder = ("Ganador" in a) or ("Ganador" in b)
-        m = {"id": id_, "home": a, "away": b, "best_of": best_of}
-        if placeholder:
-            m.update({"status": "PENDIENTE", "series_score": "0-0", "winner": None})
-            return m
-        s = _series_summary(a, b, postseason_games, best_of=best_of)
-        m.update({"status": s["status"], "series_score": s["series_score"], "winner": s["winner"]})
-        return m
-
-    # Resolver Bo1 estrictos que definen 7 y 8
-    s78 = _series_summary(s7, s8, postseason_games, best_of=1)
-    winner_78 = s78["winner"]
-    loser_78  = s8 if winner_78 == s7 else (s7 if winner_78 == s8 else None)
-
-    s910 = _series_summary(s9, s10, postseason_games, best_of=1)
-    winner_910 = s910["winner"]
-
-    seed7_final = winner_78 or "Ganador 7–8"
-    seed8_final = "Ganador WC3"
-    if loser_78 and winner_910:
-        s_wc3 = _series_summary(loser_78, winner_910, postseason_games, best_of=1)
-        if s_wc3["winner"]:
-            seed8_final = s_wc3["winner"]
-
-    # Cuartos (Bo5)
-    qf1 = _series_card("QF1", s1, seed8_final, 5)
-    qf2 = _series_card("QF2", s2, seed7_final, 5)
-    qf3 = _series_card("QF3", s3, s6,          5)
-    qf4 = _series_card("QF4", s4, s5,          5)
-
-    # Semis (Bo5)
-    semi1_a = qf1["winner"] or ("Ganador " + qf1["id"])
-    semi1_b = qf2["winner"] or ("Ganador " + qf2["id"])
-    semi2_a = qf3["winner"] or ("Ganador " + qf3["id"])
-    semi2_b = qf4["winner"] or ("Ganador " + qf4["id"])
-
-    sf1 = _series_card("SF1", semi1_a, semi1_b, 5)
-    sf2 = _series_card("SF2", semi2_a, semi2_b, 5)
-
-    # Final (Bo7)
-    final_a = sf1["winner"] or ("Ganador " + sf1["id"])
-    final_b = sf2["winner"] or ("Ganador " + sf2["id"])
-    f1 = _series_card("F1", final_a, final_b, 7)
-
-    bracket8 = {
-        "quarters": [qf1, qf2, qf3, qf4],
-        "semis":    [sf1, sf2],
-        "final":     f1,
-        "champion": f1["winner"] if f1.get("winner") else None
-    }
-    return bracket8
+    # Formato compacto (columnar) para /api/full?format=compact
+    if (_compact_version() or 0) < version:
+        _write_json_atomic(CACHE_COMPACT_FILE, snapshot_compact.compact_payload(payload))
+
+    # Modo memoria compartida: los workers sirven estos bytes sin parsear
+    # (completo y compacto, que es el que pide la página)
+    if snapshot_shm.SHM_ENABLED:
+        for path, build in ((snapshot_shm.SHM_FILE, lambda: payload),
+                            (snapshot_shm.SHM_COMPACT_FILE, lambda: snapshot_compact.compact_payload(payload))):
+            if (snapshot_shm.published_version(path) or 0) < version:
+                body = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                snapshot_shm.publish(body, version, path)
+
+    if STATIC_EXPORT_DIR and not static_export.is_current(payload, STATIC_EXPORT_DIR):
+        static_export.export_site(payload, STATIC_EXPORT_DIR)
 
-# ========================= LOOP DE ACTUALIZACIÓN =========================
 def update_data_cache():
     ts = datetime.now(SCL).strftime('%Y-%m-%d %H:%M:%S')
     print(f"[{ts}] Iniciando actualización del cache...")
     try:
-        if not hasattr(standings, "compute_rows"):
-            raise AttributeError("El módulo no define compute_rows()")
+        if not hasattr(standings, "run_league_cycle"):
+            raise AttributeError("El módulo no define run_league_cycle()")
         if not hasattr(standings, "games_played_today_scl"):
             raise AttributeError("El módulo no define games_played_today_scl()")
 
-        # Standings actuales
-        rows = standings.compute_rows()
-
-        # Juegos de HOY (SCL) con exclusiones
-        games_today = standings.games_played_today_scl()
-        games_today = [g for g in games_today if not _should_exclude_game(g)]
-
-        # Postemporada completa desde SINCE
-        postseason_games = _collect_postseason_games()
-
-        # Wild Card (Bo1) — detección flexible
-        wildcard_bracket = _build_wildcard_bracket(rows, postseason_games)
+        if not _dedup_state["loaded"]:
+            _load_dedup_audit()
+        # Una sola pasada por la API: cada página se normaliza, deduplica y
+        # acumula apenas llega (standings, índice por día y postemporada)
+        cycle = standings.run_league_cycle()
+        today = standings.day_key_scl(datetime.now(SCL))
+        collisions = standings.dedup_report()
+        canonical_ids = standings.fingerprint_ids()
+
+        v = views.run({
+            "games": (cycle.digest(), cycle),
+            "config": (_config_digest(), None),
+            "today": (today, today),
+            "collisions": (derived_views.digest(collisions), collisions),
+            "canonical_ids": (derived_views.digest(canonical_ids), canonical_ids),
+        })
+        if views.last_computed:
+            print(f"Vistas recalculadas: {', '.join(views.last_computed)}")
+
+        wildcard_bracket, bracket8 = v["brackets"]
+        content = {
+            "standings": v["standings"],
+            "games_today": v["games_today"],
+            "postseason_games": v["postseason_games"],   # lista de dicts
+            "wildcard_bracket": wildcard_bracket,        # [WC1, WC2, WC3]
+            "bracket8": bracket8,                        # quarters/semis/final (+ champion)
+            "team_stats": v["team_stats"],               # {team: {runs_scored, run_diff, streak, ...}}
+            "pitching": v["pitching"],                   # {"leaders": {wins, saves}, "teams": {team: ...}}
+        }
 
-        # Bracket 8: QF/SF (Bo5) y Final (Bo7)
-        bracket8 = _build_bracket8(rows, wildcard_bracket, postseason_games)
+        # Sin cambios: no se toca el snapshot (mtime, ETag y versión quedan estables)
+        prev_payload = _load_previous_payload()
+        if _published["digest"] is None and prev_payload:
+            _published["digest"] = _content_digest(prev_payload)
+        digest = _content_digest(content)
+        if prev_payload and digest == _published["digest"]:
+            print(f"Sin cambios: se conserva el snapshot v{prev_payload.get('version')}.")
+            _publish_artifacts(prev_payload)
+            return True
 
         payload = {
-            "standings": rows,
-            "games_today": games_today,
-            "postseason_games": postseason_games,   # lista de dicts
-            "wildcard_bracket": wildcard_bracket,   # [WC1, WC2, WC3]
-            "bracket8": bracket8,                   # quarters/semis/final (+ champion)
-            "last_updated": ts
+            **content,
+            "last_updated": ts,
+            "version": time.time_ns() // 1_000_000  # ms epoch, crece en cada snapshot nuevo
         }
 
         with open(CACHE_FILE, "w", encoding="utf-8") as f:
             json.dump(payload, f, ensure_ascii=False, indent=2)
+        _published["digest"] = digest
 
+        # Delta contra el snapshot anterior (para /api/changes?since=)
+        snapshot_delta.append_delta(prev_payload, payload)
+
+        _publish_artifacts(payload)
         print("Actualización completada exitosamente.")
         return True
     except Exception as e:
         print(f"ERROR durante la actualización del cache: {e}")
         return False
 
-def _run_once_then_exit():
+def _wait_for_lease(lease, mode):
+    """
+    Bloquea hasta que este proceso sea el único updater (líder).
+    mode="exit": si otro proceso tiene el lease, retorna False de inmediato.
+    mode="wait": queda como lector del snapshot vigente hasta que el lease se libere o venza.
+    """
+    while not lease.try_acquire():
+        holder = (lease.holder() or {}).get("token")
+        if mode == "exit":
+            print(f"Otro updater tiene el lease ({holder}); saliendo.")
+            return False
+        version = (_load_previous_payload() or {}).get("version")
+        print(f"Lease tomado por {holder}; leyendo snapshot v{version}. Reintento en {LOCK_RETRY_SECONDS}s...")
+        time.sleep(LOCK_RETRY_SECONDS)
+    return True
+
+# Refresco a pedido: SIGUSR1 o refresh_trigger.REFRESH_FILE (creado por /api/refresh)
+_wake = threading.Event()
+
+def _install_wake_signal():
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: _wake.set())
+
+def _sleep_until_next_cycle(seconds):
+    """Espera el intervalo normal, o menos si llega un pedido de refresco."""
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        if _wake.is_set() or refresh_trigger.pending():
+            print("Refresco a pedido: adelantando la actualización.")
+            break
+        _wake.wait(min(1.0, deadline - time.time()))
+    _wake.clear()
+
+def _run_cycle():
+    req = refresh_trigger.pending()
     ok = update_data_cache()
+    refresh_trigger.complete(req)
+    return ok
+
+def _run_once_then_exit(lease):
+    if not _wait_for_lease(lease, LOCK_MODE):
+        sys.exit(0)
+    try:
+        ok = _run_cycle()
+    finally:
+        lease.release()
     sys.exit(0 if ok else 1)
 
 if __name__ == "__main__":
-    if "--once" in sys.argv or os.getenv("RUN_ONCE") == "1":
-        _run_once_then_exit()
+    if "--static-out" in sys.argv:
+        STATIC_EXPORT_DIR = sys.argv[sys.argv.index("--static-out") + 1]
+    if "--lock-mode" in sys.argv:
+        LOCK_MODE = sys.argv[sys.argv.index("--lock-mode") + 1]
     UPDATE_INTERVAL_SECONDS = int(os.getenv("UPDATE_INTERVAL_SECONDS", "300"))
-    while True:
-        update_data_cache()
-        print(f"Esperando {UPDATE_INTERVAL_SECONDS} segundos para la próxima actualización...")
-        try:
-            time.sleep(UPDATE_INTERVAL_SECONDS)
-        except KeyboardInterrupt:
-            print("Detenido por el usuario.")
-            break
+    # Antes de tomar el lease (en todos los modos): la app puede mandar SIGUSR1
+    # apenas el lease nos nombre, y su acción por defecto mataría el proceso
+    _install_wake_signal()
+    lease = updater_lock.UpdaterLease(ttl_seconds=LEASE_SECONDS or 3 * UPDATE_INTERVAL_SECONDS)
+    if "--once" in sys.argv or os.getenv("RUN_ONCE") == "1":
+        _run_once_then_exit(lease)
+    try:
+        while True:
+            # Renueva el lease en cada ciclo; si se perdió, vuelve a esperar (o sale)
+            if not _wait_for_lease(lease, LOCK_MODE):
+                break
+            _run_cycle()
+            print(f"Esperando {UPDATE_INTERVAL_SECONDS} segundos para la próxima actualización...")
+            _sleep_until_next_cycle(UPDATE_INTERVAL_SECONDS)
+    except KeyboardInterrupt:
+        print("Detenido por el usuario.")
+    finally:
+        lease.release()
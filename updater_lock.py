@@ -0,0 +1,145 @@
+# updater_lock.py
+"""
+Lease local para que un solo update_cache.py consulte la API a la vez.
+
+El líder deja en LOCK_FILE su token, pid, host, huella del proceso y
+vencimiento, y lo renueva en cada ciclo. Si el líder muere, el lease vence
+(o, en el mismo host, se detecta que ese proceso ya no existe) y otro
+proceso lo toma.
+
+Leer, decidir y escribir el lease ocurre siempre bajo un lock del sistema
+sobre GUARD_FILE (flock / msvcrt), que el SO libera si el proceso muere:
+dos procesos no pueden tomar el mismo lease vencido a la vez.
+"""
+import json, os, socket, time, uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCK_FILE = os.getenv("UPDATER_LOCK_FILE") or os.path.join(BASE_DIR, "update_cache.lock")
+
+
+@contextmanager
+def _guard(path):
+    """Lock exclusivo (bloqueante) sobre `path`, liberado al salir o si el proceso muere."""
+    fd = os.open(path, os.O_CREAT | os.O_RDWR)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def _boot_id():
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def process_start(pid):
+    """
+    Huella de inicio de un proceso (boot_id + starttime de /proc), o None si
+    no se puede leer. Distingue un pid reutilizado (p. ej. un contenedor
+    reiniciado con el mismo hostname y pid) del proceso original.
+    """
+    try:
+        with open(f"/proc/{int(pid)}/stat", "r") as f:
+            stat = f.read()
+    except (OSError, ValueError):
+        return None
+    fields = stat[stat.rfind(")") + 2:].split()
+    return f"{_boot_id()}:{fields[19]}" if len(fields) > 19 else None
+
+
+def _pid_alive(pid):
+    if os.name != "posix":
+        return True  # en Windows confiamos solo en el vencimiento
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class UpdaterLease:
+    def __init__(self, ttl_seconds, path=LOCK_FILE):
+        self.path = path
+        self.guard_path = f"{path}.guard"
+        self.ttl = ttl_seconds
+        self.host = socket.gethostname()
+        self.token = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def _record(self):
+        return {
+            "token": self.token,
+            "pid": os.getpid(),
+            "host": self.host,
+            "started": process_start(os.getpid()),
+            "expires_at": time.time() + self.ttl,
+        }
+
+    def holder(self):
+        """Contenido actual del lease (o None si no hay / está corrupto)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def holder_alive(self, h):
+        """
+        True si el lease `h` sigue vigente. En el mismo host además exige que
+        su proceso exista y sea el mismo que lo escribió (no un pid reutilizado).
+        """
+        if h is None or h.get("expires_at", 0) < time.time():
+            return False
+        if h.get("host") != self.host:
+            return True
+        pid = int(h.get("pid") or 0)
+        if not _pid_alive(pid):
+            return False
+        started = process_start(pid)
+        return started is None or h.get("started") is None or started == h["started"]
+
+    def _write(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._record(), f)
+        os.replace(tmp, self.path)
+
+    def try_acquire(self):
+        """
+        Toma o renueva el lease. Retorna True si este proceso es el líder.
+        """
+        with _guard(self.guard_path):
+            h = self.holder()
+            if h is not None and h.get("token") != self.token and self.holder_alive(h):
+                return False
+            self._write()
+            return True
+
+    def release(self):
+        with _guard(self.guard_path):
+            h = self.holder()
+            if h is not None and h.get("token") == self.token:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass